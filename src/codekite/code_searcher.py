@@ -1,10 +1,41 @@
 from __future__ import annotations
+import fnmatch
+import io
+import os
 import re
+from collections import deque
 from pathlib import Path
-from typing import Any, List, Dict, Optional
+from typing import Any, Callable, Deque, Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 import pathspec  # Added for .gitignore handling
 
+# Characters that give a query regex meaning; a query without any of them matches as a plain substring.
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+# Size of the leading block checked for NUL bytes to detect binary files.
+_BINARY_SNIFF_BYTES = 8192
+
+
+def _split_glob(pattern: str) -> List[str]:
+    """Splits a glob into path segments, merging consecutive ``**`` segments."""
+    parts: List[str] = []
+    if os.altsep:
+        pattern = pattern.replace(os.altsep, os.sep)
+    for part in pattern.split(os.sep):
+        if part in ("", ".") or (part == "**" and parts and parts[-1] == "**"):
+            continue
+        parts.append(part)
+    return parts
+
+
+def _match_glob_parts(path_parts: List[str], pattern_parts: List[str]) -> bool:
+    """Matches path segments against glob segments, with ``**`` matching zero or more whole segments."""
+    if not pattern_parts:
+        return not path_parts
+    head, rest = pattern_parts[0], pattern_parts[1:]
+    if head == "**":
+        return any(_match_glob_parts(path_parts[i:], rest) for i in range(len(path_parts) + 1))
+    return bool(path_parts) and fnmatch.fnmatchcase(path_parts[0], head) and _match_glob_parts(path_parts[1:], rest)
+
 
 @dataclass
 class SearchOptions:
@@ -45,21 +76,62 @@ class CodeSearcher:
                 print(f"Warning: Could not load .gitignore: {e}")
         return None
 
-    def _should_ignore(self, file: Path) -> bool:
-        """Checks if a file should be ignored based on .gitignore rules."""
+    def _should_ignore(self, rel_path: str) -> bool:
+        """Checks if a file (path relative to the repo root) should be ignored based on .gitignore rules."""
         if not self._gitignore_spec:
             return False
 
         # Always ignore .git directory contents directly if pathspec doesn't catch it implicitly
         # (though pathspec usually handles .git/ if specified in .gitignore)
-        if ".git" in file.parts:
+        if ".git" in rel_path.split(os.sep):
             return True
 
-        try:
-            rel_path = str(file.relative_to(self.repo_path))
-            return self._gitignore_spec.match_file(rel_path)
-        except ValueError:  # file might not be relative to repo_path, e.g. symlink target outside
-            return False  # Or decide to ignore such cases explicitly
+        return self._gitignore_spec.match_file(rel_path)
+
+    def _should_ignore_dir(self, rel_dir: str) -> bool:
+        """Checks if a directory (path relative to the repo root) is excluded as a whole by .gitignore rules."""
+        if not self._gitignore_spec:
+            return False
+        if os.path.basename(rel_dir) == ".git":
+            return True
+        return self._gitignore_spec.match_file(rel_dir + "/")
+
+    def _iter_files(
+        self, file_pattern: str, skip_dir: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Yields ``(path, repo-relative path)`` string pairs for regular files whose names match
+        ``file_pattern``, like ``rglob``.
+
+        Walks with ``os.scandir`` so file/directory checks use the type recorded in each directory
+        entry instead of issuing a ``stat()`` per path, and builds plain strings rather than ``Path``
+        objects for every entry. Symlinked directories are not descended into, nor are directories for
+        which ``skip_dir`` (given the repo-relative path) returns True.
+        """
+        if _split_glob(file_pattern)[-1:] == ["**"]:
+            return  # like rglob, a trailing "**" selects directories only
+        match_path = os.sep in file_pattern or (os.altsep is not None and os.altsep in file_pattern)
+        # rglob(pattern) globs "**/<pattern>": leading directories are free, and "**" spans zero or more
+        pattern_parts = _split_glob("**/" + file_pattern) if match_path else []
+        stack: List[Tuple[str, str]] = [(str(self.repo_path), "")]
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        rel_path = rel_dir + entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if skip_dir is None or not skip_dir(rel_path):
+                                stack.append((entry.path, rel_path + os.sep))
+                            continue
+                        if match_path:
+                            matched = _match_glob_parts(rel_path.split(os.sep), pattern_parts)
+                        else:
+                            matched = fnmatch.fnmatchcase(entry.name, file_pattern)
+                        if matched and entry.is_file():
+                            yield entry.path, rel_path
+            except OSError:
+                continue
 
     def search_text(
         self, query: str, file_pattern: str = "*.py", options: Optional[SearchOptions] = None
@@ -85,35 +157,49 @@ class CodeSearcher:
 
         regex_flags = 0 if current_options.case_sensitive else re.IGNORECASE
         regex = re.compile(query, regex_flags)
-
-        for file in self.repo_path.rglob(file_pattern):
-            if current_options.use_gitignore and self._should_ignore(file):
-                continue
-            if not file.is_file():
+        # Case-sensitive literal queries are checked with a substring test, which is much cheaper than
+        # running the regex engine on every line and gives the same answer.
+        line_matches: Callable[[str], Any] = regex.search
+        if current_options.case_sensitive and not _REGEX_METACHARS.intersection(query):
+            line_matches = lambda line: query in line  # noqa: E731
+
+        # Prune ignored directories (.git, node_modules/, build/, ...) during the walk instead of
+        # visiting every file beneath them only to discard it.
+        skip_dir = self._should_ignore_dir if current_options.use_gitignore else None
+        for file, rel_path in self._iter_files(file_pattern, skip_dir):
+            if current_options.use_gitignore and self._should_ignore(rel_path):
                 continue
             try:
-                with open(file, "r", encoding="utf-8", errors="ignore") as f:
-                    lines = f.readlines()  # Read all lines to handle context
-
-                for i, line_content in enumerate(lines):
-                    if regex.search(line_content):
-                        start_context_before = max(0, i - current_options.context_lines_before)
-                        context_before = [l.rstrip("\n") for l in lines[start_context_before:i]]
-
-                        # Context after should not include the matching line itself
-                        start_context_after = i + 1
-                        end_context_after = start_context_after + current_options.context_lines_after
-                        context_after = [l.rstrip("\n") for l in lines[start_context_after:end_context_after]]
-
-                        matches.append(
-                            {
-                                "file": str(file.relative_to(self.repo_path)),
+                # Stream the file line by line; only the last `context_lines_before` lines are kept, and
+                # matches stay pending until their `context_lines_after` lines have been read.
+                context_before_window: Deque[str] = deque(maxlen=current_options.context_lines_before)
+                pending: Deque[Dict[str, Any]] = deque()
+                with open(file, "rb") as raw:
+                    # Skip binary files (images, archives, compiled objects) the way grep does: a NUL byte
+                    # in the first block. This costs one small read instead of decoding the whole file.
+                    if b"\0" in raw.read(_BINARY_SNIFF_BYTES):
+                        continue
+                    raw.seek(0)
+                    f = io.TextIOWrapper(raw, encoding="utf-8", errors="ignore")
+                    for i, line_content in enumerate(f):
+                        line = line_content.rstrip("\n")
+                        for pending_match in pending:
+                            pending_match["context_after"].append(line)
+                        while pending and len(pending[0]["context_after"]) >= current_options.context_lines_after:
+                            pending.popleft()
+
+                        if line_matches(line_content):
+                            match: Dict[str, Any] = {
+                                "file": rel_path,
                                 "line_number": i + 1,  # 1-indexed
-                                "line": line_content.rstrip("\n"),
-                                "context_before": context_before,
-                                "context_after": context_after,
+                                "line": line,
+                                "context_before": list(context_before_window),
+                                "context_after": [],
                             }
-                        )
+                            matches.append(match)
+                            if current_options.context_lines_after > 0:
+                                pending.append(match)
+                        context_before_window.append(line)
             except Exception as e:
                 # Log the exception for debugging purposes
                 print(f"Error searching file {file}: {e}")
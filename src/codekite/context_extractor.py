@@ -34,8 +34,7 @@ class ContextExtractor:
         ext = Path(file_path).suffix.lower()
         abs_path = self.repo_path / file_path
         try:
-            with open(abs_path, "r", encoding="utf-8", errors="ignore") as f:
-                code = f.read()
+            code = abs_path.read_bytes()
         except Exception:
             return []
         if ext in TreeSitterSymbolExtractor.LANGUAGES:
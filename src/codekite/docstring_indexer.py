@@ -232,7 +232,8 @@ class DocstringIndexer:
         all_files = [f["path"] for f in self.repo.get_file_tree() if not f.get("is_dir", False)]
 
         if file_extensions:
-            files_to_process = [fp for fp in all_files if any(fp.endswith(ext) for ext in file_extensions)]
+            ext_tuple = tuple(file_extensions)  # str.endswith checks a tuple of suffixes in one C call
+            files_to_process = [fp for fp in all_files if fp.endswith(ext_tuple)]
         else:
             files_to_process = all_files
 
@@ -3,7 +3,7 @@ import os
 import time
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import pathspec
 from .tree_sitter_symbol_extractor import TreeSitterSymbolExtractor
 
@@ -29,15 +29,43 @@ class RepoMapper:
         return None
 
     def _should_ignore(self, file: Path) -> bool:
-        rel_path = str(file.relative_to(self.repo_path))
+        return self._is_ignored(str(file.relative_to(self.repo_path)))
+
+    def _is_ignored(self, rel_path: str) -> bool:
         # Always ignore .git and its contents
-        if ".git" in file.parts:
+        if ".git" in rel_path.split(os.sep):
             return True
         # Ignore files matching .gitignore
         if self._gitignore_spec and self._gitignore_spec.match_file(rel_path):
             return True
         return False
 
+    def _iter_entries(self) -> Iterator[Tuple[os.DirEntry, str]]:
+        """
+        Yields ``(entry, repo-relative path)`` for every non-ignored file and directory under the repo.
+
+        Walks with ``os.scandir`` so callers can use the entry's cached type instead of stat'ing each path.
+        Directories that are excluded as a whole (``.git`` or a .gitignore match on ``dir/``) are not
+        descended into, and neither are symlinked directories.
+        """
+        stack: List[Tuple[str, str]] = [(str(self.repo_path), "")]
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                rel_path = rel_dir + entry.name
+                if entry.name == ".git" or self._is_ignored(rel_path):
+                    continue
+                yield entry, rel_path
+                if entry.is_dir(follow_symlinks=False) and not (
+                    self._gitignore_spec and self._gitignore_spec.match_file(rel_path + "/")
+                ):
+                    stack.append((entry.path, rel_path + os.sep))
+
     def get_file_tree(self) -> List[Dict[str, Any]]:
         """
         Returns a list of dicts representing all files in the repo.
@@ -46,15 +74,14 @@ class RepoMapper:
         if self._file_tree is not None:
             return self._file_tree
         tree = []
-        for path in self.repo_path.rglob("*"):
-            if self._should_ignore(path):
-                continue
+        for entry, rel_path in self._iter_entries():
+            is_file = entry.is_file()
             tree.append(
                 {
-                    "path": str(path.relative_to(self.repo_path)),
-                    "is_dir": path.is_dir(),
-                    "name": path.name,
-                    "size": path.stat().st_size if path.is_file() else 0,
+                    "path": rel_path,
+                    "is_dir": entry.is_dir(),
+                    "name": entry.name,
+                    "size": entry.stat().st_size if is_file else 0,
                 }
             )
         self._file_tree = tree
@@ -65,14 +92,12 @@ class RepoMapper:
         Scan all supported files and update symbol map incrementally.
         Uses mtime to avoid redundant parsing.
         """
-        for file in self.repo_path.rglob("*"):
-            if not file.is_file():
-                continue
-            if self._should_ignore(file):
+        for entry, _ in self._iter_entries():
+            if not entry.is_file():
                 continue
-            ext = file.suffix.lower()
+            ext = os.path.splitext(entry.name)[1].lower()
             if ext in TreeSitterSymbolExtractor.LANGUAGES or ext == ".py":
-                self._scan_file(file)
+                self._scan_file(Path(entry.path))
 
     def _scan_file(self, file: Path) -> None:
         try:
@@ -88,8 +113,7 @@ class RepoMapper:
     def _extract_symbols_from_file(self, file: Path) -> List[Dict[str, Any]]:
         ext = file.suffix.lower()
         try:
-            with open(file, "r", encoding="utf-8", errors="ignore") as f:
-                code = f.read()
+            code = file.read_bytes()
         except Exception as e:
             logging.warning(f"Could not read file {file} for symbol extraction: {e}")
             return []
@@ -126,7 +150,7 @@ class RepoMapper:
         ext = abs_path.suffix.lower()
         if ext in TreeSitterSymbolExtractor.LANGUAGES:
             try:
-                code = abs_path.read_text(encoding="utf-8", errors="ignore")
+                code = abs_path.read_bytes()
                 symbols = TreeSitterSymbolExtractor.extract_symbols(ext, code)
                 for s in symbols:
                     s["file"] = str(abs_path.relative_to(self.repo_path))
@@ -7,6 +7,8 @@ from .vector_searcher import VectorSearcher
 from .llm_context import ContextAssembler
 import os
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import subprocess
 from pathlib import Path
 
@@ -15,6 +17,20 @@ if TYPE_CHECKING:
     from .summaries import Summarizer, OpenAIConfig, AnthropicConfig, GoogleConfig
     from .dependency_analyzer import DependencyAnalyzer
 
+# extract_symbols_bulk parses in the calling process below this many files per worker, where
+# starting processes and loading grammars in each would cost more than the parsing itself
+BULK_FILES_PER_WORKER = 16
+# RepoMapper per repository root, kept for the life of an extract_symbols_bulk worker process
+_worker_mappers: Dict[str, RepoMapper] = {}
+
+
+def _extract_symbols_chunk(repo_path: str, file_paths: List[str]) -> List[List[Dict[str, Any]]]:
+    """Worker-process entry point for :meth:`Repository.extract_symbols_bulk`."""
+    mapper = _worker_mappers.get(repo_path)
+    if mapper is None:
+        mapper = _worker_mappers[repo_path] = RepoMapper(repo_path)
+    return [mapper.extract_symbols(path) for path in file_paths]
+
 
 class Repository:
     """
@@ -83,7 +99,10 @@ class Repository:
         if token:
             # Insert token for private repos
             clone_url = url.replace("https://", f"https://{token}@")
-        subprocess.run(["git", "clone", "--depth=1", clone_url, str(repo_path)], check=True)
+        # Only the current tree is analysed: skip history, other branches and tags.
+        subprocess.run(
+            ["git", "clone", "--depth=1", "--single-branch", "--no-tags", clone_url, str(repo_path)], check=True
+        )
         return repo_path
 
     def get_file_tree(self) -> List[Dict[str, Any]]:
@@ -107,6 +126,34 @@ class Repository:
         """
         return self.mapper.extract_symbols(file_path)  # type: ignore[arg-type]
 
+    def extract_symbols_bulk(
+        self, file_paths: List[str], max_workers: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extracts symbols from many files, spread over worker processes.
+
+        Tree-sitter query matching and building the symbol dicts hold the GIL, so threads do not
+        speed this up; separate processes do, on machines with several cores. Each process pays
+        its own start-up and grammar loading, so lists shorter than ``BULK_FILES_PER_WORKER`` per
+        worker, or ``max_workers=1``, are parsed in the calling process instead.
+
+        Args:
+            file_paths (List[str]): Paths relative to the repository root.
+            max_workers (Optional[int], optional): Number of worker processes. Defaults to the CPU count.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: The symbols of each file, keyed by the given path.
+        """
+        workers = min(max_workers or os.cpu_count() or 1, len(file_paths) // BULK_FILES_PER_WORKER)
+        if workers <= 1:
+            return {path: self.mapper.extract_symbols(path) for path in file_paths}
+        # A few contiguous chunks per worker keep inter-process traffic low while still balancing load
+        chunk_size = -(-len(file_paths) // (workers * 4))
+        chunks = [file_paths[start : start + chunk_size] for start in range(0, len(file_paths), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_extract_symbols_chunk, repeat(self.repo_path), chunks)
+            return dict(zip(file_paths, (symbols for chunk in results for symbols in chunk)))
+
     def search_text(self, query: str, file_pattern: str = "*") -> List[Dict[str, Any]]:
         """
         Searches for text in the repository.
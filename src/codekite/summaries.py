@@ -1,11 +1,16 @@
 """Handles code summarization using LLMs."""
 
 import os
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Optional, Any, Union, Dict, List, Protocol, runtime_checkable
+import re
+import json
+import asyncio
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Optional, Any, Union, Dict, List, Tuple, Protocol, runtime_checkable
 import logging
 import tiktoken
 
+from .summaries_cache import SummaryCache
+
 
 # Define a Protocol for LLM clients to help with type checking
 @runtime_checkable
@@ -98,6 +103,31 @@ class GoogleConfig:
 MAX_CODE_LENGTH_CHARS = 50000  # Max characters for a single function/class summary
 MAX_FILE_SUMMARIZE_CHARS = 25000  # Max characters for file content in summarize_file
 OPENAI_MAX_PROMPT_TOKENS = 15000  # Max tokens for the prompt to OpenAI
+BATCH_ITEM_DELIMITER = "<<<ITEM {index}>>>"  # Marks each code item inside a summarize_batch prompt
+_BATCH_ITEM_RE = re.compile(r"<<<ITEM (\d+)>>>")
+
+# Per symbol kind: (accepted symbol types, system prompt, what the summary should describe)
+_SYMBOL_PROMPTS: Dict[str, Tuple[Tuple[str, ...], str, str]] = {
+    "function": (
+        ("FUNCTION", "METHOD"),
+        "You are an expert assistant skilled in creating concise code summaries for functions.",
+        "Describe its purpose, parameters, and return value.",
+    ),
+    "class": (
+        ("CLASS",),
+        "You are an expert assistant skilled in creating concise code summaries for classes.",
+        "Describe its purpose, key attributes, and main methods.",
+    ),
+}
+
+
+def _checked_summary(summary: Optional[str], target: str) -> str:
+    """Returns the stripped summary, raising LLMError if the LLM produced no text."""
+    if not summary or not summary.strip():
+        logger.warning(f"LLM returned an empty or whitespace-only summary for {target}.")
+        raise LLMError(f"LLM returned an empty summary for {target}.")
+    logger.debug(f"LLM summary for {target} (first 200 chars): {summary[:200]}...")
+    return summary.strip()
 
 
 class Summarizer:
@@ -107,6 +137,7 @@ class Summarizer:
     config: Optional[Union[OpenAIConfig, AnthropicConfig, GoogleConfig]]
     repo: "Repository"
     _llm_client: Optional[Any]  # type: ignore
+    _async_llm_client: Optional[Any]
 
     def _get_tokenizer(self, model_name: str):
         if model_name in self._tokenizer_cache:
@@ -237,6 +268,9 @@ class Summarizer:
         repo: "Repository",
         config: Optional[Union[OpenAIConfig, AnthropicConfig, GoogleConfig]] = None,
         llm_client: Optional[Any] = None,
+        async_llm_client: Optional[Any] = None,
+        cache_dir: Optional[str] = None,
+        cache_enabled: Optional[bool] = None,
     ):
         """
         Initializes the Summarizer.
@@ -247,9 +281,20 @@ class Summarizer:
                     If None, defaults to OpenAIConfig.
             llm_client: Optional pre-initialized LLM client. If None, client will be
                         lazy-loaded on first use based on the config.
+            async_llm_client: Optional pre-initialized async LLM client used by the ``asummarize_*``
+                        methods. If None, it is lazy-loaded on first async use.
+            cache_dir: Optional directory for persisting summaries across runs. Summaries are
+                        also cached in memory while caching is enabled.
+            cache_enabled: Reuse the previous reply when the same model, generation settings and
+                        prompt are used again. Defaults to enabled when ``cache_dir`` is given and
+                        disabled otherwise, so every call reaches the provider unless asked.
         """
         self.repo = repo
+        if cache_enabled is None:
+            cache_enabled = cache_dir is not None
+        self._cache: Optional[SummaryCache] = SummaryCache(cache_dir) if cache_enabled else None
         self._llm_client = llm_client  # Store provided llm_client directly
+        self._async_llm_client = async_llm_client
         self.config = config  # Store provided config
 
         if self._llm_client is None:
@@ -341,19 +386,236 @@ class Summarizer:
             logger.error(f"Error initializing LLM client: {e}")
             raise LLMError(f"Error initializing LLM client: {e}") from e
 
-    def summarize_file(self, file_path: str) -> str:
+    def _get_async_llm_client(self) -> Any:
+        """Lazy loads the async LLM client (AsyncOpenAI, AsyncAnthropic, or genai's ``aio`` client)."""
+        if self._async_llm_client is not None:
+            return self._async_llm_client
+
+        try:
+            if isinstance(self.config, OpenAIConfig):
+                from openai import AsyncOpenAI
+
+                if self.config.base_url:
+                    client = AsyncOpenAI(api_key=self.config.api_key, base_url=self.config.base_url)
+                else:
+                    client = AsyncOpenAI(api_key=self.config.api_key)
+            elif isinstance(self.config, AnthropicConfig):
+                from anthropic import AsyncAnthropic
+
+                client = AsyncAnthropic(api_key=self.config.api_key)  # type: ignore # Different client type
+            elif isinstance(self.config, GoogleConfig):
+                # google-genai exposes its async API on the regular client as ``client.aio``
+                client = self._get_llm_client().aio
+            else:
+                raise LLMError(
+                    "No async LLM client available. Pass async_llm_client when constructing Summarizer without a config."
+                )
+        except ImportError as e:
+            raise LLMError(f"Async LLM client could not be imported: {e}") from e
+
+        self._async_llm_client = client
+        return self._async_llm_client
+
+    def _prepare_llm_request(
+        self, system_prompt_text: str, user_prompt_text: str, json_output: bool = False
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
         """
-        Summarizes the content of a single file.
+        Builds the keyword arguments for one provider request.
+
+        Returns:
+            ``(early_reply, request_kwargs)``. ``early_reply`` is set when the request must not be
+            sent (e.g. the OpenAI prompt exceeds OPENAI_MAX_PROMPT_TOKENS); it is then returned to
+            the caller in place of the model's reply.
+        """
+        # If a custom llm_client was provided without a config, assume it accepts an OpenAI-style call.
+        # This is used in tests with FakeOpenAI.
+        if self.config is None:
+            return None, {
+                "messages": [
+                    {"role": "system", "content": system_prompt_text},
+                    {"role": "user", "content": user_prompt_text},
+                ]
+            }
+        if isinstance(self.config, OpenAIConfig):
+            messages_for_api = [
+                {"role": "system", "content": system_prompt_text},
+                {"role": "user", "content": user_prompt_text},
+            ]
+            prompt_token_count = self._count_openai_chat_tokens(messages_for_api, self.config.model)
+            if prompt_token_count is not None and prompt_token_count > OPENAI_MAX_PROMPT_TOKENS:
+                return (
+                    f"Summary generation failed: OpenAI prompt too large ({prompt_token_count} tokens). Limit is {OPENAI_MAX_PROMPT_TOKENS} tokens.",
+                    {},
+                )
+            request_kwargs: Dict[str, Any] = {
+                "model": self.config.model,
+                "messages": messages_for_api,
+                "temperature": self.config.temperature,
+                "max_tokens": self.config.max_tokens,
+            }
+            if json_output:
+                request_kwargs["response_format"] = {"type": "json_object"}
+            return None, request_kwargs
+        if isinstance(self.config, AnthropicConfig):
+            # Anthropic has no JSON mode; the system prompt is expected to ask for JSON when json_output is set.
+            return None, {
+                "model": self.config.model,
+                "system": system_prompt_text,
+                "messages": [{"role": "user", "content": user_prompt_text}],
+                "max_tokens": self.config.max_tokens,
+                "temperature": self.config.temperature,
+            }
+        if isinstance(self.config, GoogleConfig):
+            if not genai_types:
+                raise LLMError(
+                    "Google Gen AI SDK (google-genai) types not available. SDK might not be installed correctly."
+                )
+
+            generation_config_params: Dict[str, Any] = (
+                self.config.model_kwargs.copy() if self.config.model_kwargs is not None else {}
+            )
+
+            if self.config.temperature is not None:
+                generation_config_params["temperature"] = self.config.temperature
+            if self.config.max_output_tokens is not None:
+                generation_config_params["max_output_tokens"] = self.config.max_output_tokens
+            if json_output:
+                generation_config_params["response_mime_type"] = "application/json"
+
+            final_sdk_params = generation_config_params if generation_config_params else None
+            return None, {
+                "model": self.config.model,
+                "contents": user_prompt_text,
+                "generation_config": final_sdk_params,
+            }
+        # This should never happen with our current logic, but as a safeguard
+        raise LLMError(f"Unsupported LLM configuration type: {type(self.config)}")
+
+    def _llm_endpoint(self, client: Any) -> Any:
+        """Returns the request method on ``client`` for the configured provider (sync or async client)."""
+        if isinstance(self.config, AnthropicConfig):
+            return client.messages.create
+        if isinstance(self.config, GoogleConfig):
+            return client.models.generate_content
+        return client.chat.completions.create
+
+    def _read_llm_response(self, response: Any, target: str) -> str:
+        """Extracts the reply text from a provider response."""
+        if isinstance(self.config, AnthropicConfig):
+            return response.content[0].text
+        if isinstance(self.config, GoogleConfig):
+            # Check for blocked prompt first
+            if (
+                hasattr(response, "prompt_feedback")
+                and response.prompt_feedback
+                and response.prompt_feedback.block_reason
+            ):
+                logger.warning(
+                    f"Google LLM prompt for {target} blocked. Reason: {response.prompt_feedback.block_reason}"
+                )
+                return f"Summary generation failed: Prompt blocked by API (Reason: {response.prompt_feedback.block_reason})"
+            if not response.text:
+                logger.warning(f"Google LLM returned no text for {target}. Response: {response}")
+                return "Summary generation failed: No text returned by API."
+            return response.text
+        summary = response.choices[0].message.content
+        if self.config is not None and response.usage:
+            logger.debug(f"OpenAI API usage for {target}: {response.usage}")
+        return summary
+
+    def _call_llm(self, system_prompt_text: str, user_prompt_text: str, target: str, json_output: bool = False) -> str:
+        """
+        Sends one system/user prompt pair to the configured provider and returns the raw reply text.
 
         Args:
-            file_path: The path to the file to summarize.
+            system_prompt_text: The system prompt (ignored by Google, which only receives the user prompt).
+            user_prompt_text: The user prompt containing the code to summarize.
+            target: Human-readable description of what is being summarized, used in log messages.
+            json_output: Ask the provider for a JSON-only reply where it supports a native JSON mode.
 
         Returns:
-            A string containing the summary of the file.
+            The reply text, or a "Summary generation failed: ..." message when the request was refused locally
+            or blocked by the provider.
+        """
+        client = self._get_llm_client()
+        early_reply, request_kwargs = self._prepare_llm_request(system_prompt_text, user_prompt_text, json_output)
+        if early_reply is not None:
+            return early_reply
+        cache_key, cached = self._lookup_cache(system_prompt_text, user_prompt_text, target)
+        if cached is not None:
+            return cached
+        if self.config is None:
+            try:
+                reply = self._read_llm_response(self._llm_endpoint(client)(**request_kwargs), target)
+            except (AttributeError, TypeError) as e:
+                # If that fails, the client might have a different interface
+                logger.warning(f"Custom LLM client doesn't support OpenAI-style interface: {e}")
+                raise LLMError(f"Custom LLM client without config doesn't support expected interface: {e}")
+        else:
+            reply = self._read_llm_response(self._llm_endpoint(client)(**request_kwargs), target)
+        self._store_cache(cache_key, reply)
+        return reply
+
+    async def _acall_llm(
+        self, system_prompt_text: str, user_prompt_text: str, target: str, json_output: bool = False
+    ) -> str:
+        """Async counterpart of :meth:`_call_llm`, using the provider's async client."""
+        client = self._get_async_llm_client()
+        early_reply, request_kwargs = self._prepare_llm_request(system_prompt_text, user_prompt_text, json_output)
+        if early_reply is not None:
+            return early_reply
+        cache_key, cached = self._lookup_cache(system_prompt_text, user_prompt_text, target)
+        if cached is not None:
+            return cached
+        if self.config is None:
+            try:
+                reply = self._read_llm_response(await self._llm_endpoint(client)(**request_kwargs), target)
+            except (AttributeError, TypeError) as e:
+                logger.warning(f"Custom async LLM client doesn't support OpenAI-style interface: {e}")
+                raise LLMError(f"Custom LLM client without config doesn't support expected interface: {e}")
+        else:
+            reply = self._read_llm_response(await self._llm_endpoint(client)(**request_kwargs), target)
+        self._store_cache(cache_key, reply)
+        return reply
+
+    def _lookup_cache(
+        self, system_prompt_text: str, user_prompt_text: str, target: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Returns ``(cache_key, cached_reply)``; both are None when caching is disabled."""
+        if self._cache is None:
+            return None, None
+        model_name = self.config.model if self.config is not None else ""
+        cache_key = SummaryCache.key(model_name, system_prompt_text, user_prompt_text, self._generation_params())
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Summary cache hit for {target}.")
+        return cache_key, cached
+
+    def _generation_params(self) -> Dict[str, Any]:
+        """Returns every config setting that can change the reply (all fields but the model and API key)."""
+        if self.config is None:
+            return {}
+        # Covers temperature, token limits, base_url and GoogleConfig.model_kwargs (safety settings, top_p, ...)
+        return {f.name: getattr(self.config, f.name) for f in fields(self.config) if f.name not in ("api_key", "model")}
+
+    def _store_cache(self, cache_key: Optional[str], reply: Optional[str]) -> None:
+        """Caches a usable reply. Empty replies and provider refusals are not cached."""
+        if self._cache is None or cache_key is None or not reply or not reply.strip():
+            return
+        if reply.startswith("Summary generation failed"):
+            return
+        self._cache.set(cache_key, reply)
+
+    def _prepare_file_summary(self, file_path: str) -> Tuple[Optional[str], str, str]:
+        """
+        Loads a file and builds its summary prompts.
+
+        Returns:
+            ``(early_result, system_prompt, user_prompt)``. ``early_result`` is set when the file
+            should not be sent to the LLM (empty or too large) and is the value to return instead.
 
         Raises:
             FileNotFoundError: If the file_path does not exist.
-            LLMError: If there's an error from the LLM API or an empty summary.
         """
         logger.debug(f"Attempting to summarize file: {file_path}")
         abs_file_path = self.repo.get_abs_path(file_path)  # Use get_abs_path
@@ -366,13 +628,17 @@ class Summarizer:
 
         if not file_content.strip():
             logger.warning(f"File {abs_file_path} is empty or contains only whitespace. Skipping summary.")
-            return ""
+            return "", "", ""
 
         if len(file_content) > MAX_FILE_SUMMARIZE_CHARS:
             logger.warning(
                 f"File content for {file_path} ({len(file_content)} chars) is too large for summarization (limit: {MAX_FILE_SUMMARIZE_CHARS})."
             )
-            return f"File content too large ({len(file_content)} characters) to summarize with current limits."
+            return (
+                f"File content too large ({len(file_content)} characters) to summarize with current limits.",
+                "",
+                "",
+            )
 
         # Max model context is 128000 tokens. Avg ~4 chars/token -> ~512,000 chars for total message.
         # Let's set a threshold for the raw content itself.
@@ -383,14 +649,11 @@ class Summarizer:
                 f"to summarize reliably. Skipping."
             )
             # Return a placeholder summary or an empty string
-            return f"File content too large ({len(file_content)} characters) to summarize."
+            return f"File content too large ({len(file_content)} characters) to summarize.", "", ""
 
         system_prompt_text = "You are an expert assistant skilled in creating concise and informative code summaries."
         user_prompt_text = f"Summarize the following code from the file '{file_path}'. Provide a high-level overview of its purpose, key components, and functionality. Focus on what the code does, not just how it's written. The code is:\n\n```\n{file_content}\n```"
 
-        client = self._get_llm_client()
-        summary = ""
-
         logger.debug(f"System Prompt for {file_path}: {system_prompt_text}")
         logger.debug(f"User Prompt for {file_path} (first 200 chars): {user_prompt_text[:200]}...")
         # Get model name from config if available, otherwise pass None for default
@@ -400,249 +663,115 @@ class Summarizer:
             logger.debug(f"Estimated tokens for user prompt ({file_path}): {token_count}")
         else:
             logger.debug(f"Approximate characters for user prompt ({file_path}): {len(user_prompt_text)}")
+        return None, system_prompt_text, user_prompt_text
 
-        try:
-            # If a custom llm_client was provided without a config, use it directly
-            if self.config is None:
-                # For custom llm_client without config, assume it knows how to handle the prompt
-                # This is used in tests with FakeOpenAI
-                try:
-                    # Try OpenAI-style interface first
-                    response = client.chat.completions.create(
-                        messages=[
-                            {"role": "system", "content": system_prompt_text},
-                            {"role": "user", "content": user_prompt_text},
-                        ]
-                    )
-                    summary = response.choices[0].message.content
-                except (AttributeError, TypeError) as e:
-                    # If that fails, the client might have a different interface
-                    logger.warning(f"Custom LLM client doesn't support OpenAI-style interface: {e}")
-                    raise LLMError(f"Custom LLM client without config doesn't support expected interface: {e}")
-            elif isinstance(self.config, OpenAIConfig):
-                messages_for_api = [
-                    {"role": "system", "content": system_prompt_text},
-                    {"role": "user", "content": user_prompt_text},
-                ]
-                prompt_token_count = self._count_openai_chat_tokens(messages_for_api, self.config.model)
-                if prompt_token_count is not None and prompt_token_count > OPENAI_MAX_PROMPT_TOKENS:
-                    summary = f"Summary generation failed: OpenAI prompt too large ({prompt_token_count} tokens). Limit is {OPENAI_MAX_PROMPT_TOKENS} tokens."
-                else:
-                    response = client.chat.completions.create(
-                        model=self.config.model,
-                        messages=messages_for_api,
-                        temperature=self.config.temperature,
-                        max_tokens=self.config.max_tokens,
-                    )
-                    summary = response.choices[0].message.content
-                    if response.usage:
-                        logger.debug(f"OpenAI API usage for {file_path}: {response.usage}")
-            elif isinstance(self.config, AnthropicConfig):
-                response = client.messages.create(
-                    model=self.config.model,
-                    system=system_prompt_text,
-                    messages=[{"role": "user", "content": user_prompt_text}],
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature,
-                )
-                summary = response.content[0].text
-            elif isinstance(self.config, GoogleConfig):
-                if not genai_types:
-                    raise LLMError(
-                        "Google Gen AI SDK (google-genai) types not available. SDK might not be installed correctly."
-                    )
-
-                generation_config_params: Dict[str, Any] = (
-                    self.config.model_kwargs.copy() if self.config.model_kwargs is not None else {}
-                )
-
-                if self.config.temperature is not None:
-                    generation_config_params["temperature"] = self.config.temperature
-                if self.config.max_output_tokens is not None:
-                    generation_config_params["max_output_tokens"] = self.config.max_output_tokens
-
-                final_sdk_params = generation_config_params if generation_config_params else None
-
-                response = client.models.generate_content(
-                    model=self.config.model, contents=user_prompt_text, generation_config=final_sdk_params
-                )
-                # Check for blocked prompt first
-                if (
-                    hasattr(response, "prompt_feedback")
-                    and response.prompt_feedback
-                    and response.prompt_feedback.block_reason
-                ):
-                    logger.warning(
-                        f"Google LLM prompt for file {file_path} blocked. Reason: {response.prompt_feedback.block_reason}"
-                    )
-                    summary = f"Summary generation failed: Prompt blocked by API (Reason: {response.prompt_feedback.block_reason})"
-                elif not response.text:
-                    logger.warning(f"Google LLM returned no text for file {file_path}. Response: {response}")
-                    summary = "Summary generation failed: No text returned by API."
-                else:
-                    summary = response.text
-
-            if not summary or not summary.strip():
-                logger.warning(f"LLM returned an empty or whitespace-only summary for file {file_path}.")
-                raise LLMError(f"LLM returned an empty summary for file {file_path}.")
-
-            logger.debug(f"LLM summary for file {file_path} (first 200 chars): {summary[:200]}...")
-            return summary.strip()
-
-        except Exception as e:
-            logger.error(f"Error communicating with LLM API for file {file_path}: {e}")
-            raise LLMError(f"Error communicating with LLM API: {e}") from e
-
-    def summarize_function(self, file_path: str, function_name: str) -> str:
+    def _prepare_symbol_summary(self, file_path: str, symbol_name: str, kind: str) -> Tuple[Optional[str], str, str]:
         """
-        Summarizes a specific function within a file.
+        Looks up a function or class and builds its summary prompts.
 
         Args:
-            file_path: The path to the file containing the function.
-            function_name: The name of the function to summarize.
+            file_path: The path to the file containing the symbol.
+            symbol_name: The name of the function or class.
+            kind: ``"function"`` or ``"class"``.
 
         Returns:
-            A string containing the summary of the function.
+            ``(early_result, system_prompt, user_prompt)``; ``early_result`` is set when the symbol is
+            too large to send and is the value to return instead.
 
         Raises:
-            FileNotFoundError: If the file_path does not exist.
-            ValueError: If the function cannot be found in the file.
-            LLMError: If there's an error from the LLM API or an empty summary.
+            ValueError: If the symbol cannot be found in the file.
         """
-        logger.debug(f"Attempting to summarize function: {function_name} in file: {file_path}")
+        symbol_types = _SYMBOL_PROMPTS[kind][0]
+        logger.debug(f"Attempting to summarize {kind}: {symbol_name} in file: {file_path}")
 
         symbols = self.repo.extract_symbols(file_path)
-        function_code = None
+        symbol_code = None
         for symbol in symbols:
             # Use node_path if available (more precise), fallback to name
             current_symbol_name = symbol.get("node_path", symbol.get("name"))
-            if current_symbol_name == function_name and symbol.get("type", "").upper() in ["FUNCTION", "METHOD"]:
-                function_code = symbol.get("code")
+            if current_symbol_name == symbol_name and symbol.get("type", "").upper() in symbol_types:
+                symbol_code = symbol.get("code")
                 break
 
-        if not function_code:
-            raise ValueError(f"Could not find function '{function_name}' in '{file_path}'.")
+        if not symbol_code:
+            raise ValueError(f"Could not find {kind} '{symbol_name}' in '{file_path}'.")
+        return self._build_symbol_prompts(file_path, symbol_name, kind, symbol_code)
 
+    def _build_symbol_prompts(
+        self, file_path: str, symbol_name: str, kind: str, symbol_code: str
+    ) -> Tuple[Optional[str], str, str]:
+        """Builds the summary prompts for a symbol whose code is already known; returns as _prepare_symbol_summary."""
+        _, system_prompt_text, prompt_focus = _SYMBOL_PROMPTS[kind]
         # Max model context is 128000 tokens. Avg ~4 chars/token -> ~512,000 chars for total message.
         # Let's set a threshold for the raw content itself.
         MAX_CHARS_FOR_SUMMARY = 400_000  # Approx 100k tokens
-        if len(function_code) > MAX_CHARS_FOR_SUMMARY:
+        if len(symbol_code) > MAX_CHARS_FOR_SUMMARY:
             logger.warning(
-                f"Function {function_name} in file {file_path} content is too large ({len(function_code)} chars) "
+                f"{kind.capitalize()} {symbol_name} in file {file_path} content is too large ({len(symbol_code)} chars) "
                 f"to summarize reliably. Skipping."
             )
-            return f"Function content too large ({len(function_code)} characters) to summarize."
+            return f"{kind.capitalize()} content too large ({len(symbol_code)} characters) to summarize.", "", ""
 
-        system_prompt_text = "You are an expert assistant skilled in creating concise code summaries for functions."
-        user_prompt_text = f"Summarize the following function named '{function_name}' from the file '{file_path}'. Describe its purpose, parameters, and return value. The function definition is:\n\n```\n{function_code}\n```"
+        user_prompt_text = f"Summarize the following {kind} named '{symbol_name}' from the file '{file_path}'. {prompt_focus} The {kind} definition is:\n\n```\n{symbol_code}\n```"
 
-        client = self._get_llm_client()
-        summary = ""
-
-        logger.debug(f"System Prompt for {function_name} in {file_path}: {system_prompt_text}")
-        logger.debug(f"User Prompt for {function_name} in {file_path} (first 200 chars): {user_prompt_text[:200]}...")
+        logger.debug(f"System Prompt for {symbol_name} in {file_path}: {system_prompt_text}")
+        logger.debug(f"User Prompt for {symbol_name} in {file_path} (first 200 chars): {user_prompt_text[:200]}...")
         # Get model name from config if available, otherwise pass None for default
         model_name = self.config.model if self.config is not None and hasattr(self.config, "model") else None
         token_count = self._count_tokens(user_prompt_text, model_name)
-        logger.debug(f"Token count for {function_name} in {file_path}: {token_count}")
+        logger.debug(f"Token count for {symbol_name} in {file_path}: {token_count}")
+        return None, system_prompt_text, user_prompt_text
 
-        try:
-            # If a custom llm_client was provided without a config, use it directly
-            if self.config is None:
-                # For custom llm_client without config, assume it knows how to handle the prompt
-                # This is used in tests with FakeOpenAI
-                try:
-                    # Try OpenAI-style interface first
-                    response = client.chat.completions.create(
-                        messages=[
-                            {"role": "system", "content": system_prompt_text},
-                            {"role": "user", "content": user_prompt_text},
-                        ]
-                    )
-                    summary = response.choices[0].message.content
-                except (AttributeError, TypeError) as e:
-                    # If that fails, the client might have a different interface
-                    # In a real implementation, you'd need more robust handling here
-                    logger.warning(f"Custom LLM client doesn't support OpenAI-style interface: {e}")
-                    raise LLMError(f"Custom LLM client without config doesn't support expected interface: {e}")
-            elif isinstance(self.config, OpenAIConfig):
-                messages_for_api = [
-                    {"role": "system", "content": system_prompt_text},
-                    {"role": "user", "content": user_prompt_text},
-                ]
-                prompt_token_count = self._count_openai_chat_tokens(messages_for_api, self.config.model)
-                if prompt_token_count is not None and prompt_token_count > OPENAI_MAX_PROMPT_TOKENS:
-                    summary = f"Summary generation failed: OpenAI prompt too large ({prompt_token_count} tokens). Limit is {OPENAI_MAX_PROMPT_TOKENS} tokens."
-                else:
-                    response = client.chat.completions.create(
-                        model=self.config.model,
-                        messages=messages_for_api,
-                        temperature=self.config.temperature,
-                        max_tokens=self.config.max_tokens,
-                    )
-                    summary = response.choices[0].message.content
-                    if response.usage:
-                        logger.debug(f"OpenAI API usage for {function_name} in {file_path}: {response.usage}")
-            elif isinstance(self.config, AnthropicConfig):
-                response = client.messages.create(
-                    model=self.config.model,
-                    system=system_prompt_text,
-                    messages=[{"role": "user", "content": user_prompt_text}],
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature,
-                )
-                summary = response.content[0].text
-                # Anthropic usage might be in response.usage (confirm API docs)
-                # Example: logger.debug(f"Anthropic API usage for {function_name} in {file_path}: {response.usage}")
-            elif isinstance(self.config, GoogleConfig):
-                if not genai_types:
-                    raise LLMError(
-                        "Google Gen AI SDK (google-genai) types not available. SDK might not be installed correctly."
-                    )
+    def summarize_file(self, file_path: str) -> str:
+        """
+        Summarizes the content of a single file.
 
-                generation_config_params: Dict[str, Any] = (
-                    self.config.model_kwargs.copy() if self.config.model_kwargs is not None else {}
-                )
+        Args:
+            file_path: The path to the file to summarize.
+
+        Returns:
+            A string containing the summary of the file.
 
-                if self.config.temperature is not None:
-                    generation_config_params["temperature"] = self.config.temperature
-                if self.config.max_output_tokens is not None:
-                    generation_config_params["max_output_tokens"] = self.config.max_output_tokens
+        Raises:
+            FileNotFoundError: If the file_path does not exist.
+            LLMError: If there's an error from the LLM API or an empty summary.
+        """
+        early_result, system_prompt_text, user_prompt_text = self._prepare_file_summary(file_path)
+        if early_result is not None:
+            return early_result
 
-                final_sdk_params = generation_config_params if generation_config_params else None
+        try:
+            summary = self._call_llm(system_prompt_text, user_prompt_text, f"file {file_path}")
+            return _checked_summary(summary, f"file {file_path}")
+        except Exception as e:
+            logger.error(f"Error communicating with LLM API for file {file_path}: {e}")
+            raise LLMError(f"Error communicating with LLM API: {e}") from e
 
-                response = client.models.generate_content(
-                    model=self.config.model, contents=user_prompt_text, generation_config=final_sdk_params
-                )
-                if (
-                    hasattr(response, "prompt_feedback")
-                    and response.prompt_feedback
-                    and response.prompt_feedback.block_reason
-                ):
-                    logger.warning(
-                        f"Google LLM prompt for {function_name} in {file_path} blocked. Reason: {response.prompt_feedback.block_reason}"
-                    )
-                    summary = f"Summary generation failed: Prompt blocked by API (Reason: {response.prompt_feedback.block_reason})"
-                elif not response.text:
-                    logger.warning(
-                        f"Google LLM returned no text for {function_name} in {file_path}. Response: {response}"
-                    )
-                    summary = "Summary generation failed: No text returned by API."
-                else:
-                    summary = response.text
-            else:
-                # This should never happen with our current logic, but as a safeguard
-                raise LLMError(f"Unsupported LLM configuration type: {type(self.config) if self.config else None}")
+    def summarize_function(self, file_path: str, function_name: str) -> str:
+        """
+        Summarizes a specific function within a file.
 
-            if not summary or not summary.strip():
-                logger.warning(
-                    f"LLM returned an empty or whitespace-only summary for function {function_name} in {file_path}."
-                )
-                raise LLMError(f"LLM returned an empty summary for function {function_name}.")
+        Args:
+            file_path: The path to the file containing the function.
+            function_name: The name of the function to summarize.
 
-            logger.debug(f"LLM summary for {function_name} in {file_path} (first 200 chars): {summary[:200]}...")
-            return summary.strip()
+        Returns:
+            A string containing the summary of the function.
 
+        Raises:
+            FileNotFoundError: If the file_path does not exist.
+            ValueError: If the function cannot be found in the file.
+            LLMError: If there's an error from the LLM API or an empty summary.
+        """
+        early_result, system_prompt_text, user_prompt_text = self._prepare_symbol_summary(
+            file_path, function_name, "function"
+        )
+        if early_result is not None:
+            return early_result
+
+        try:
+            summary = self._call_llm(system_prompt_text, user_prompt_text, f"{function_name} in {file_path}")
+            return _checked_summary(summary, f"function {function_name}")
         except Exception as e:
             logger.error(f"Error communicating with LLM API for function {function_name} in {file_path}: {e}")
             raise LLMError(f"Error communicating with LLM API for function {function_name}: {e}") from e
@@ -663,136 +792,398 @@ class Summarizer:
             ValueError: If the class cannot be found in the file.
             LLMError: If there's an error from the LLM API or an empty summary.
         """
-        logger.debug(f"Attempting to summarize class: {class_name} in file: {file_path}")
+        early_result, system_prompt_text, user_prompt_text = self._prepare_symbol_summary(
+            file_path, class_name, "class"
+        )
+        if early_result is not None:
+            return early_result
 
-        symbols = self.repo.extract_symbols(file_path)
-        class_code = None
+        try:
+            summary = self._call_llm(system_prompt_text, user_prompt_text, f"{class_name} in {file_path}")
+            return _checked_summary(summary, f"class {class_name}")
+        except Exception as e:
+            logger.error(f"Error communicating with LLM API for class {class_name} in {file_path}: {e}")
+            raise LLMError(f"Error communicating with LLM API for class {class_name}: {e}") from e
+
+    async def asummarize_file(self, file_path: str) -> str:
+        """Async version of :meth:`summarize_file` using the provider's async client."""
+        early_result, system_prompt_text, user_prompt_text = self._prepare_file_summary(file_path)
+        if early_result is not None:
+            return early_result
+
+        try:
+            summary = await self._acall_llm(system_prompt_text, user_prompt_text, f"file {file_path}")
+            return _checked_summary(summary, f"file {file_path}")
+        except Exception as e:
+            logger.error(f"Error communicating with LLM API for file {file_path}: {e}")
+            raise LLMError(f"Error communicating with LLM API: {e}") from e
+
+    async def asummarize_function(self, file_path: str, function_name: str) -> str:
+        """Async version of :meth:`summarize_function` using the provider's async client."""
+        early_result, system_prompt_text, user_prompt_text = self._prepare_symbol_summary(
+            file_path, function_name, "function"
+        )
+        if early_result is not None:
+            return early_result
+
+        try:
+            summary = await self._acall_llm(system_prompt_text, user_prompt_text, f"{function_name} in {file_path}")
+            return _checked_summary(summary, f"function {function_name}")
+        except Exception as e:
+            logger.error(f"Error communicating with LLM API for function {function_name} in {file_path}: {e}")
+            raise LLMError(f"Error communicating with LLM API for function {function_name}: {e}") from e
+
+    async def asummarize_class(self, file_path: str, class_name: str) -> str:
+        """Async version of :meth:`summarize_class` using the provider's async client."""
+        early_result, system_prompt_text, user_prompt_text = self._prepare_symbol_summary(
+            file_path, class_name, "class"
+        )
+        if early_result is not None:
+            return early_result
+
+        try:
+            summary = await self._acall_llm(system_prompt_text, user_prompt_text, f"{class_name} in {file_path}")
+            return _checked_summary(summary, f"class {class_name}")
+        except Exception as e:
+            logger.error(f"Error communicating with LLM API for class {class_name} in {file_path}: {e}")
+            raise LLMError(f"Error communicating with LLM API for class {class_name}: {e}") from e
+
+    async def asummarize_files(self, file_paths: List[str], max_concurrency: int = 8) -> List[str]:
+        """
+        Summarizes several files concurrently, with at most ``max_concurrency`` requests in flight.
+
+        Args:
+            file_paths: The paths of the files to summarize.
+            max_concurrency: Maximum number of simultaneous LLM requests.
+
+        Returns:
+            Summaries in the same order as ``file_paths``.
+
+        Raises:
+            ValueError: If max_concurrency is not positive.
+            FileNotFoundError: If a file does not exist.
+            LLMError: If there's an error from the LLM API or an empty summary.
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _bounded(file_path: str) -> str:
+            async with semaphore:
+                return await self.asummarize_file(file_path)
+
+        return list(await asyncio.gather(*(_bounded(path) for path in file_paths)))
+
+    def summarize_files(self, file_paths: List[str], max_concurrency: int = 8) -> List[str]:
+        """
+        Synchronous wrapper around :meth:`asummarize_files`.
+
+        Must not be called from a running event loop; await :meth:`asummarize_files` there instead.
+        """
+        return asyncio.run(self.asummarize_files(file_paths, max_concurrency=max_concurrency))
+
+    def summarize_batch(self, items: List[Tuple[str, Optional[str]]], batch_size: int = 16) -> List[str]:
+        """
+        Summarizes many files and/or symbols, sending several items per LLM request.
+
+        Items are grouped into prompts of at most ``batch_size`` items (and at most
+        MAX_FILE_SUMMARIZE_CHARS of code), so the system prompt and request overhead are
+        paid once per group instead of once per item. The model is asked for a JSON reply;
+        any item missing from that reply is summarized individually instead, as is any
+        symbol whose code alone exceeds MAX_FILE_SUMMARIZE_CHARS.
+
+        Args:
+            items: ``(file_path, symbol_name)`` pairs. A ``symbol_name`` of None summarizes the
+                whole file; otherwise it names a function, method, or class in that file.
+            batch_size: Maximum number of items sent in a single request.
+
+        Returns:
+            Summaries in the same order as ``items``.
+
+        Raises:
+            FileNotFoundError: If a file does not exist.
+            ValueError: If a symbol cannot be found, or batch_size is not positive.
+            LLMError: If there's an error from the LLM API or an empty summary.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer.")
+
+        results: List[Optional[str]] = [None] * len(items)
+        pending: List[Tuple[int, str, str, str]] = []  # (item index, kind, label, code)
+        symbols_by_file: Dict[str, List[Dict[str, Any]]] = {}
+
+        for index, (file_path, symbol_name) in enumerate(items):
+            if symbol_name is None:
+                abs_file_path = self.repo.get_abs_path(file_path)
+                try:
+                    code = self.repo.get_file_content(abs_file_path)
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"File not found via repo: {abs_file_path}")
+                if not code.strip():
+                    results[index] = ""
+                    continue
+                if len(code) > MAX_FILE_SUMMARIZE_CHARS:
+                    results[index] = (
+                        f"File content too large ({len(code)} characters) to summarize with current limits."
+                    )
+                    continue
+                pending.append((index, "file", f"file '{file_path}'", code))
+            else:
+                if file_path not in symbols_by_file:
+                    symbols_by_file[file_path] = self.repo.extract_symbols(file_path)
+                symbol = self._find_summarizable_symbol(symbols_by_file[file_path], symbol_name)
+                if symbol is None:
+                    raise ValueError(f"Could not find function or class '{symbol_name}' in '{file_path}'.")
+                kind = "class" if symbol.get("type", "").upper() == "CLASS" else "function"
+                code = symbol.get("code") or ""
+                if not code:
+                    raise ValueError(f"Could not find {kind} '{symbol_name}' in '{file_path}'.")
+                if len(code) > MAX_FILE_SUMMARIZE_CHARS:
+                    # Too large to share a prompt with other items; the single-item path applies its own limits.
+                    results[index] = self._summarize_item(file_path, symbol_name, kind)
+                    continue
+                pending.append((index, kind, f"{kind} '{symbol_name}' from the file '{file_path}'", code))
+
+        batch: List[Tuple[int, str, str, str]] = []
+        batch_chars = 0
+        for entry in pending:
+            if batch and (len(batch) >= batch_size or batch_chars + len(entry[3]) > MAX_FILE_SUMMARIZE_CHARS):
+                self._summarize_batch_group(batch, items, results)
+                batch, batch_chars = [], 0
+            batch.append(entry)
+            batch_chars += len(entry[3])
+        if batch:
+            self._summarize_batch_group(batch, items, results)
+
+        return [summary or "" for summary in results]
+
+    @staticmethod
+    def _find_summarizable_symbol(symbols: List[Dict[str, Any]], symbol_name: str) -> Optional[Dict[str, Any]]:
+        """Returns the function, method, or class symbol named ``symbol_name``, if present."""
         for symbol in symbols:
             # Use node_path if available (more precise), fallback to name
             current_symbol_name = symbol.get("node_path", symbol.get("name"))
-            if current_symbol_name == class_name and symbol.get("type", "").upper() == "CLASS":
-                class_code = symbol.get("code")
-                break
-
-        if not class_code:
-            raise ValueError(f"Could not find class '{class_name}' in '{file_path}'.")
+            if current_symbol_name == symbol_name and symbol.get("type", "").upper() in ["FUNCTION", "METHOD", "CLASS"]:
+                return symbol
+        return None
 
-        # Max model context is 128000 tokens. Avg ~4 chars/token -> ~512,000 chars for total message.
-        # Let's set a threshold for the raw content itself.
-        MAX_CHARS_FOR_SUMMARY = 400_000  # Approx 100k tokens
-        if len(class_code) > MAX_CHARS_FOR_SUMMARY:
+    def _summarize_batch_group(
+        self,
+        batch: List[Tuple[int, str, str, str]],
+        items: List[Tuple[str, Optional[str]]],
+        results: List[Optional[str]],
+    ) -> None:
+        """Summarizes one group of pending batch items in a single request, filling ``results`` in place."""
+        system_prompt_text = (
+            "You are an expert assistant skilled in creating concise and informative code summaries. "
+            "Respond only with valid JSON."
+        )
+        prompt_parts = [
+            f"Summarize each of the following {len(batch)} code items. For each item, provide a high-level overview "
+            "of its purpose, key components, and functionality. Reply with a JSON object of the form "
+            '{"summaries": [{"i": <item number>, "summary": "<summary>"}]} containing exactly one entry per item.'
+        ]
+        for position, (_, _, label, code) in enumerate(batch):
+            prompt_parts.append(f"{BATCH_ITEM_DELIMITER.format(index=position)} {label}\n```\n{code}\n```")
+        user_prompt_text = "\n\n".join(prompt_parts)
+
+        target = f"batch of {len(batch)} items"
+        logger.debug(f"User Prompt for {target} (first 200 chars): {user_prompt_text[:200]}...")
+        try:
+            reply = self._call_llm(system_prompt_text, user_prompt_text, target, json_output=True)
+        except Exception as e:
+            logger.error(f"Error communicating with LLM API for {target}: {e}")
+            raise LLMError(f"Error communicating with LLM API for {target}: {e}") from e
+
+        parsed = _parse_batch_reply(reply or "", len(batch))
+        for position, (index, kind, _, _) in enumerate(batch):
+            summary = parsed.get(position)
+            if summary and summary.strip():
+                results[index] = summary.strip()
+                continue
+            # Fall back to a dedicated request for anything the batch reply did not cover.
+            file_path, symbol_name = items[index]
             logger.warning(
-                f"Class {class_name} in file {file_path} content is too large ({len(class_code)} chars) "
-                f"to summarize reliably. Skipping."
+                f"Batch reply had no summary for item {position} ({file_path}); summarizing it individually."
             )
-            return f"Class content too large ({len(class_code)} characters) to summarize."
+            results[index] = self._summarize_item(file_path, symbol_name, kind)
+
+    def _summarize_item(self, file_path: str, symbol_name: Optional[str], kind: str) -> str:
+        """Summarizes one batch item with its own request, as summarize_file/function/class would."""
+        if symbol_name is None:
+            return self.summarize_file(file_path)
+        if kind == "class":
+            return self.summarize_class(file_path, symbol_name)
+        return self.summarize_function(file_path, symbol_name)
+
+    def _batch_dir(self, batch_dir: Optional[str]) -> str:
+        """Returns the directory holding batch manifests (default: ``<repo>/.codekite/batches``)."""
+        if batch_dir:
+            return batch_dir
+        return os.path.join(str(self.repo.local_path), ".codekite", "batches")
+
+    def submit_batch(self, items: List[Tuple[str, Optional[str]]], batch_dir: Optional[str] = None) -> str:
+        """
+        Submits summaries for many files and/or symbols to the provider's batch API.
 
-        system_prompt_text = "You are an expert assistant skilled in creating concise code summaries for classes."
-        user_prompt_text = f"Summarize the following class named '{class_name}' from the file '{file_path}'. Describe its purpose, key attributes, and main methods. The class definition is:\n\n```\n{class_code}\n```"
+        Batch jobs complete asynchronously (within 24 hours) at a lower per-token price than
+        interactive requests. A manifest is written to ``batch_dir`` so :meth:`fetch_batch` can
+        collect the results after a restart.
 
-        client = self._get_llm_client()
-        summary = ""
+        Args:
+            items: ``(file_path, symbol_name)`` pairs, as for :meth:`summarize_batch`.
+            batch_dir: Directory for batch manifests. Defaults to ``<repo>/.codekite/batches``.
 
-        logger.debug(f"System Prompt for {class_name} in {file_path}: {system_prompt_text}")
-        logger.debug(f"User Prompt for {class_name} (first 200 chars): {user_prompt_text[:200]}...")
-        # Get model name from config if available, otherwise pass None for default
-        model_name = self.config.model if self.config is not None and hasattr(self.config, "model") else None
-        token_count = self._count_tokens(user_prompt_text, model_name)
-        logger.debug(f"Token count for {class_name} in {file_path}: {token_count}")
+        Returns:
+            The provider's batch ID.
 
-        try:
-            # If a custom llm_client was provided without a config, use it directly
-            if self.config is None:
-                # For custom llm_client without config, assume it knows how to handle the prompt
-                # This is used in tests with FakeOpenAI
-                try:
-                    # Try OpenAI-style interface first
-                    response = client.chat.completions.create(
-                        messages=[
-                            {"role": "system", "content": system_prompt_text},
-                            {"role": "user", "content": user_prompt_text},
-                        ]
-                    )
-                    summary = response.choices[0].message.content
-                except (AttributeError, TypeError) as e:
-                    logger.warning(f"Custom LLM client doesn't support OpenAI-style interface: {e}")
-                    raise LLMError(f"Custom LLM client without config doesn't support expected interface: {e}")
-            elif isinstance(self.config, OpenAIConfig):
-                messages_for_api = [
-                    {"role": "system", "content": system_prompt_text},
-                    {"role": "user", "content": user_prompt_text},
-                ]
-                prompt_token_count = self._count_openai_chat_tokens(messages_for_api, self.config.model)
-                if prompt_token_count is not None and prompt_token_count > OPENAI_MAX_PROMPT_TOKENS:
-                    summary = f"Summary generation failed: OpenAI prompt too large ({prompt_token_count} tokens). Limit is {OPENAI_MAX_PROMPT_TOKENS} tokens."
-                else:
-                    response = client.chat.completions.create(
-                        model=self.config.model,
-                        messages=messages_for_api,
-                        temperature=self.config.temperature,
-                        max_tokens=self.config.max_tokens,
-                    )
-                    summary = response.choices[0].message.content
-                    if response.usage:
-                        logger.debug(f"OpenAI API usage for {class_name} in {file_path}: {response.usage}")
-            elif isinstance(self.config, AnthropicConfig):
-                response = client.messages.create(
-                    model=self.config.model,
-                    system=system_prompt_text,
-                    messages=[{"role": "user", "content": user_prompt_text}],
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature,
+        Raises:
+            FileNotFoundError: If a file does not exist.
+            ValueError: If a symbol cannot be found.
+            LLMError: If no provider config is set or the batch cannot be submitted.
+        """
+        from .summaries_batch import get_batch_strategy
+
+        strategy = get_batch_strategy(self.config, self._get_llm_client())
+
+        keys: List[str] = []
+        early_results: Dict[str, str] = {}
+        requests: Dict[str, Dict[str, Any]] = {}
+        symbols_by_file: Dict[str, List[Dict[str, Any]]] = {}
+        for file_path, symbol_name in items:
+            if symbol_name is None:
+                key = file_path
+                early_result, system_prompt_text, user_prompt_text = self._prepare_file_summary(file_path)
+            else:
+                key = f"{file_path}::{symbol_name}"
+                if file_path not in symbols_by_file:
+                    symbols_by_file[file_path] = self.repo.extract_symbols(file_path)
+                symbol = self._find_summarizable_symbol(symbols_by_file[file_path], symbol_name)
+                kind = "class" if symbol is not None and symbol.get("type", "").upper() == "CLASS" else "function"
+                if symbol is None or not symbol.get("code"):
+                    raise ValueError(f"Could not find {kind} '{symbol_name}' in '{file_path}'.")
+                # Symbols were extracted once per file above; only the prompt is built per item
+                early_result, system_prompt_text, user_prompt_text = self._build_symbol_prompts(
+                    file_path, symbol_name, kind, symbol["code"]
                 )
-                summary = response.content[0].text
-                # Anthropic usage might be in response.usage (confirm API docs)
-                # Example: logger.debug(f"Anthropic API usage for {class_name} in {file_path}: {response.usage}")
-            elif isinstance(self.config, GoogleConfig):
-                if not genai_types:
-                    raise LLMError(
-                        "Google Gen AI SDK (google-genai) types not available. SDK might not be installed correctly."
-                    )
+            if early_result is None:
+                early_result, request_kwargs = self._prepare_llm_request(system_prompt_text, user_prompt_text)
+            if early_result is not None:
+                early_results[key] = early_result
+                continue
+            # Custom IDs are positional; Anthropic restricts them to [a-zA-Z0-9_-]
+            requests[f"item-{len(keys)}"] = request_kwargs
+            keys.append(key)
+
+        if not requests:
+            raise LLMError("Nothing to submit: every item was empty or too large to summarize.")
 
-                generation_config_params: Dict[str, Any] = (
-                    self.config.model_kwargs.copy() if self.config.model_kwargs is not None else {}
-                )
+        try:
+            batch_id = strategy.submit(requests)
+        except Exception as e:
+            logger.error(f"Error submitting {strategy.provider} batch: {e}")
+            raise LLMError(f"Error submitting {strategy.provider} batch: {e}") from e
+
+        manifest_dir = self._batch_dir(batch_dir)
+        os.makedirs(manifest_dir, exist_ok=True)
+        with open(os.path.join(manifest_dir, _manifest_name(batch_id)), "w", encoding="utf-8") as fp:
+            json.dump(
+                {"provider": strategy.provider, "batch_id": batch_id, "keys": keys, "early_results": early_results},
+                fp,
+            )
+        logger.info(f"Submitted {strategy.provider} batch {batch_id} with {len(requests)} requests.")
+        return batch_id
 
-                if self.config.temperature is not None:
-                    generation_config_params["temperature"] = self.config.temperature
-                if self.config.max_output_tokens is not None:
-                    generation_config_params["max_output_tokens"] = self.config.max_output_tokens
+    def fetch_batch(self, batch_id: str, batch_dir: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Collects the summaries of a batch created by :meth:`submit_batch`.
 
-                final_sdk_params = generation_config_params if generation_config_params else None
+        Args:
+            batch_id: The ID returned by :meth:`submit_batch`.
+            batch_dir: Directory for batch manifests. Defaults to ``<repo>/.codekite/batches``.
 
-                response = client.models.generate_content(
-                    model=self.config.model, contents=user_prompt_text, generation_config=final_sdk_params
-                )
-                if (
-                    hasattr(response, "prompt_feedback")
-                    and response.prompt_feedback
-                    and response.prompt_feedback.block_reason
-                ):
-                    logger.warning(
-                        f"Google LLM prompt for {class_name} in {file_path} blocked. Reason: {response.prompt_feedback.block_reason}"
-                    )
-                    summary = f"Summary generation failed: Prompt blocked by API (Reason: {response.prompt_feedback.block_reason})"
-                elif not response.text:
-                    logger.warning(f"Google LLM returned no text for {class_name} in {file_path}. Response: {response}")
-                    summary = "Summary generation failed: No text returned by API."
-                else:
-                    summary = response.text
-            else:
-                # This should never happen with our current logic, but as a safeguard
-                raise LLMError(f"Unsupported LLM configuration type: {type(self.config) if self.config else None}")
+        Returns:
+            None while the batch is still running. Otherwise a dict keyed by ``file_path`` for
+            file items and ``"file_path::symbol_name"`` for symbol items. Requests that failed
+            at the provider are omitted.
 
-            if not summary or not summary.strip():
-                logger.warning(
-                    f"LLM returned an empty or whitespace-only summary for class {class_name} in {file_path}."
-                )
-                raise LLMError(f"LLM returned an empty summary for class {class_name}.")
+        Raises:
+            FileNotFoundError: If no manifest exists for batch_id.
+            LLMError: If the batch failed, expired, or was cancelled.
+        """
+        from .summaries_batch import BATCH_COMPLETED, BATCH_FAILED, get_batch_strategy
 
-            logger.debug(f"LLM summary for {class_name} in {file_path} (first 200 chars): {summary[:200]}...")
-            return summary.strip()
+        manifest_path = os.path.join(self._batch_dir(batch_dir), _manifest_name(batch_id))
+        with open(manifest_path, "r", encoding="utf-8") as fp:
+            manifest = json.load(fp)
 
-        except Exception as e:
-            logger.error(f"Error communicating with LLM API for class {class_name} in {file_path}: {e}")
-            raise LLMError(f"Error communicating with LLM API for class {class_name}: {e}") from e
+        strategy = get_batch_strategy(self.config, self._get_llm_client())
+        if strategy.provider != manifest["provider"]:
+            raise LLMError(
+                f"Batch {batch_id} was submitted to {manifest['provider']}, but this Summarizer is configured for {strategy.provider}."
+            )
+
+        status = strategy.status(batch_id)
+        if status == BATCH_FAILED:
+            raise LLMError(f"{strategy.provider} batch {batch_id} did not complete.")
+        if status != BATCH_COMPLETED:
+            return None
+
+        keys: List[str] = manifest["keys"]
+        custom_ids = [f"item-{i}" for i in range(len(keys))]
+        replies = strategy.results(batch_id, custom_ids)
+        summaries: Dict[str, str] = dict(manifest["early_results"])
+        for custom_id, key in zip(custom_ids, keys):
+            reply = replies.get(custom_id)
+            if reply and reply.strip():
+                summaries[key] = reply.strip()
+            else:
+                logger.warning(f"No summary returned for {key} in batch {batch_id}.")
+        return summaries
+
+
+def _manifest_name(batch_id: str) -> str:
+    """Returns a filesystem-safe manifest file name for a provider batch ID."""
+    return batch_id.replace("/", "_") + ".json"
+
+
+def _parse_batch_reply(reply: str, count: int) -> Dict[int, str]:
+    """
+    Extracts per-item summaries from a summarize_batch reply.
+
+    Accepts ``{"summaries": [{"i": 0, "summary": "..."}]}``, a bare list of such entries, or a
+    bare list of strings. If the reply is not valid JSON, falls back to splitting the text on
+    the ``<<<ITEM i>>>`` delimiters echoed by the model.
+    """
+    text = reply.strip()
+    if text.startswith("```"):
+        # Tolerate replies wrapped in a Markdown code fence
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[len("json") :]
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+
+    summaries: Dict[int, str] = {}
+    if data is not None:
+        entries = data.get("summaries", []) if isinstance(data, dict) else data
+        if isinstance(entries, list):
+            for position, entry in enumerate(entries):
+                if isinstance(entry, str):
+                    summaries[position] = entry
+                elif isinstance(entry, dict) and isinstance(entry.get("summary"), str):
+                    try:
+                        summaries[int(entry.get("i", position))] = entry["summary"]
+                    except (TypeError, ValueError):
+                        continue
+        return {i: s for i, s in summaries.items() if 0 <= i < count}
+
+    pieces = _BATCH_ITEM_RE.split(reply)
+    # re.split with one group yields [preamble, index, text, index, text, ...]
+    for raw_index, body in zip(pieces[1::2], pieces[2::2]):
+        index = int(raw_index)
+        if 0 <= index < count and body.strip():
+            summaries[index] = body.strip()
+    return summaries
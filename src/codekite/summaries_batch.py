@@ -0,0 +1,174 @@
+"""Provider batch APIs for non-interactive summarization.
+
+Batch jobs trade latency (results arrive within hours) for lower per-token cost and
+separate rate limits. Each strategy wraps one provider:
+
+* OpenAIBatchStrategy - uploads a JSONL file and creates a ``/v1/batches`` job.
+* AnthropicBatchStrategy - uses the Message Batches API.
+* GoogleBatchStrategy - submits inline requests to the Gemini batch API.
+
+Strategies receive request keyword arguments already built by
+:meth:`codekite.summaries.Summarizer._prepare_llm_request`, keyed by a custom ID.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+from .summaries import AnthropicConfig, GoogleConfig, LLMError, OpenAIConfig
+
+__all__ = [
+    "BatchStrategy",
+    "OpenAIBatchStrategy",
+    "AnthropicBatchStrategy",
+    "GoogleBatchStrategy",
+    "get_batch_strategy",
+]
+
+logger = logging.getLogger(__name__)
+
+# Normalised job states returned by BatchStrategy.status
+BATCH_PENDING = "pending"
+BATCH_COMPLETED = "completed"
+BATCH_FAILED = "failed"
+
+
+class BatchStrategy:
+    """
+    Abstract interface for submitting summary requests to a provider batch API.
+    """
+
+    provider: str = ""
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    def submit(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        """Submits ``{custom_id: request_kwargs}`` and returns the provider's batch ID."""
+        raise NotImplementedError
+
+    def status(self, batch_id: str) -> str:
+        """Returns BATCH_PENDING, BATCH_COMPLETED, or BATCH_FAILED."""
+        raise NotImplementedError
+
+    def results(self, batch_id: str, custom_ids: List[str]) -> Dict[str, str]:
+        """Returns ``{custom_id: reply_text}`` for every request that succeeded."""
+        raise NotImplementedError
+
+
+class OpenAIBatchStrategy(BatchStrategy):
+    provider = "openai"
+    endpoint = "/v1/chat/completions"
+
+    def submit(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        lines = [
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": self.endpoint, "body": body})
+            for custom_id, body in requests.items()
+        ]
+        payload = io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+        input_file = self.client.files.create(file=("codekite_batch.jsonl", payload), purpose="batch")
+        batch = self.client.batches.create(input_file_id=input_file.id, endpoint=self.endpoint, completion_window="24h")
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status == "completed":
+            return BATCH_COMPLETED
+        if batch.status in ("failed", "expired", "cancelled"):
+            return BATCH_FAILED
+        return BATCH_PENDING
+
+    def results(self, batch_id: str, custom_ids: List[str]) -> Dict[str, str]:
+        batch = self.client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            return {}
+        content = self.client.files.content(batch.output_file_id).text
+        replies: Dict[str, str] = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(f"OpenAI batch request {record.get('custom_id')} failed: {record.get('error')}")
+                continue
+            replies[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        return replies
+
+
+class AnthropicBatchStrategy(BatchStrategy):
+    provider = "anthropic"
+
+    def submit(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        batch = self.client.messages.batches.create(
+            requests=[{"custom_id": custom_id, "params": params} for custom_id, params in requests.items()]
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        batch = self.client.messages.batches.retrieve(batch_id)
+        return BATCH_COMPLETED if batch.processing_status == "ended" else BATCH_PENDING
+
+    def results(self, batch_id: str, custom_ids: List[str]) -> Dict[str, str]:
+        replies: Dict[str, str] = {}
+        for entry in self.client.messages.batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                logger.warning(f"Anthropic batch request {entry.custom_id} did not succeed: {entry.result.type}")
+                continue
+            replies[entry.custom_id] = entry.result.message.content[0].text
+        return replies
+
+
+class GoogleBatchStrategy(BatchStrategy):
+    provider = "google"
+
+    def __init__(self, client: Any, model: str) -> None:
+        super().__init__(client)
+        self.model = model
+
+    def submit(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        # Inline requests carry no custom ID; responses come back in submission order.
+        inlined = []
+        for params in requests.values():
+            inline_request: Dict[str, Any] = {"contents": [{"role": "user", "parts": [{"text": params["contents"]}]}]}
+            if params.get("generation_config"):
+                inline_request["config"] = params["generation_config"]
+            inlined.append(inline_request)
+        job = self.client.batches.create(model=self.model, src=inlined)
+        return job.name
+
+    def status(self, batch_id: str) -> str:
+        job = self.client.batches.get(name=batch_id)
+        state = getattr(job.state, "name", str(job.state))
+        if state == "JOB_STATE_SUCCEEDED":
+            return BATCH_COMPLETED
+        if state in ("JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"):
+            return BATCH_FAILED
+        return BATCH_PENDING
+
+    def results(self, batch_id: str, custom_ids: List[str]) -> Dict[str, str]:
+        job = self.client.batches.get(name=batch_id)
+        replies: Dict[str, str] = {}
+        for custom_id, inlined in zip(custom_ids, job.dest.inlined_responses or []):
+            response = getattr(inlined, "response", None)
+            if response is None or not response.text:
+                logger.warning(f"Google batch request {custom_id} returned no text: {getattr(inlined, 'error', None)}")
+                continue
+            replies[custom_id] = response.text
+        return replies
+
+
+def get_batch_strategy(
+    config: Optional[Union[OpenAIConfig, AnthropicConfig, GoogleConfig]], client: Any
+) -> BatchStrategy:
+    """Returns the batch strategy matching ``config``, bound to the provider ``client``."""
+    if isinstance(config, OpenAIConfig):
+        return OpenAIBatchStrategy(client)
+    if isinstance(config, AnthropicConfig):
+        return AnthropicBatchStrategy(client)
+    if isinstance(config, GoogleConfig):
+        return GoogleBatchStrategy(client, config.model)
+    raise LLMError("Batch summarization requires an OpenAIConfig, AnthropicConfig, or GoogleConfig.")
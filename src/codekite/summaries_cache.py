@@ -0,0 +1,80 @@
+"""Content-addressed cache for LLM summaries."""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryCache:
+    """
+    Maps ``sha256(model | generation params | system prompt | user prompt)`` to the summary the model returned.
+
+    Entries are always kept in memory. When ``cache_dir`` is set they are also written there,
+    one ``<key>.txt`` file per entry, so unchanged code is not re-summarized across runs.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, str] = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(model: str, system_prompt: str, user_prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Returns the cache key for one request; ``params`` holds settings such as temperature."""
+        # Values JSON cannot encode (e.g. SDK enums in model_kwargs) use repr(); an unstable repr only costs misses
+        encoded_params = json.dumps(params or {}, sort_keys=True, default=repr)
+        return hashlib.sha256(
+            b"|".join(
+                [
+                    model.encode("utf-8"),
+                    encoded_params.encode("utf-8"),
+                    system_prompt.encode("utf-8"),
+                    user_prompt.encode("utf-8"),
+                ]
+            )
+        ).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir or "", f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached summary for ``key``, or None on a miss."""
+        if key in self._entries:
+            return self._entries[key]
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as fp:
+                summary = fp.read()
+        except FileNotFoundError:
+            return None
+        self._entries[key] = summary
+        return summary
+
+    def set(self, key: str, summary: str) -> None:
+        """Stores ``summary`` under ``key``."""
+        self._entries[key] = summary
+        if not self.cache_dir:
+            return
+        # Write to a temp file first so concurrent readers never see a partial entry
+        tmp_path = f"{self._entry_path(key)}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as fp:
+                fp.write(summary)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            logger.warning(f"Could not write summary cache entry {key}: {e}")
+
+    def clear(self) -> None:
+        """Removes all entries, including those on disk."""
+        self._entries.clear()
+        if not self.cache_dir:
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".txt"):
+                os.remove(os.path.join(self.cache_dir, name))
@@ -1,8 +1,9 @@
 import os
 import logging
+import threading
 import traceback
 from pathlib import Path
-from typing import List, Dict, Optional, Any, ClassVar, cast
+from typing import List, Dict, Iterable, Optional, Any, ClassVar, Union, cast
 from tree_sitter_language_pack import get_parser, get_language
 
 # Set up module-level logger
@@ -27,6 +28,11 @@ LANGUAGES: dict[str, str] = {
 QUERIES_ROOT: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../queries"))
 
 
+def _node_text(node: Any, source_bytes: bytes) -> str:
+    """Decodes the source text spanned by ``node`` from the bytes that were parsed."""
+    return source_bytes[node.start_byte : node.end_byte].decode("utf-8", errors="ignore")
+
+
 class TreeSitterSymbolExtractor:
     """
     Multi-language symbol extractor using tree-sitter queries (tags.scm).
@@ -34,29 +40,42 @@ class TreeSitterSymbolExtractor:
     """
 
     LANGUAGES = set(LANGUAGES.keys())
-    _parsers: ClassVar[dict[str, Any]] = {}
+    # Keyed by language name, so extensions sharing a grammar (.ts/.tsx, .tf/.hcl) share one entry.
+    # Parsers hold per-parse state and must not be shared between threads; compiled queries are read-only.
+    _local: ClassVar[threading.local] = threading.local()
     _queries: ClassVar[dict[str, Any]] = {}
+    _load_lock: ClassVar[threading.Lock] = threading.Lock()
 
     @classmethod
     def get_parser(cls, ext: str) -> Optional[Any]:
+        """Returns the calling thread's parser for ``ext``, creating it on first use."""
         if ext not in LANGUAGES:
             return None
-        if ext not in cls._parsers:
-            lang_name = LANGUAGES[ext]
-            parser = get_parser(cast(Any, lang_name))  # type: ignore[arg-type]
-            cls._parsers[ext] = parser
-        return cls._parsers[ext]
+        lang_name = LANGUAGES[ext]
+        parsers: Optional[dict[str, Any]] = getattr(cls._local, "parsers", None)
+        if parsers is None:
+            parsers = cls._local.parsers = {}
+        parser = parsers.get(lang_name)
+        if parser is None:
+            parser = parsers[lang_name] = get_parser(cast(Any, lang_name))  # type: ignore[arg-type]
+        return parser
 
     @classmethod
     def get_query(cls, ext: str) -> Optional[Any]:
         if ext not in LANGUAGES:
             logger.debug(f"get_query: Extension {ext} not supported.")
             return None
-        if ext in cls._queries:
-            logger.debug(f"get_query: query cached for ext {ext}")
-            return cls._queries[ext]
-
         lang_name = LANGUAGES[ext]
+        query = cls._queries.get(lang_name)
+        if query is not None:
+            return query
+        with cls._load_lock:
+            if lang_name not in cls._queries:
+                cls._queries[lang_name] = cls._compile_query(lang_name)
+            return cls._queries[lang_name]
+
+    @staticmethod
+    def _compile_query(lang_name: str) -> Optional[Any]:
         logger.debug(f"get_query: lang={lang_name}")
         query_dir: str = lang_name
         tags_path: str = os.path.join(QUERIES_ROOT, query_dir, "tags.scm")
@@ -69,17 +88,32 @@ class TreeSitterSymbolExtractor:
             with open(tags_path, "r") as f:
                 tags_content = f.read()
             query = language.query(tags_content)
-            cls._queries[ext] = query
-            logger.debug(f"get_query: Query loaded successfully for ext {ext}")
+            logger.debug(f"get_query: Query loaded successfully for {lang_name}")
             return query
         except Exception as e:
-            logger.error(f"get_query: Query compile error for ext {ext}: {e}")
+            logger.error(f"get_query: Query compile error for {lang_name}: {e}")
             logger.error(traceback.format_exc())  # Log stack trace
             return None
 
+    @classmethod
+    def preload(cls, exts: Optional[Iterable[str]] = None) -> None:
+        """
+        Loads grammars and compiles tags queries ahead of the first extraction.
+
+        Args:
+            exts: File extensions to prepare. Defaults to every supported extension.
+        """
+        for ext in exts if exts is not None else LANGUAGES:
+            cls.get_parser(ext)
+            cls.get_query(ext)
+
     @staticmethod
-    def extract_symbols(ext: str, source_code: str) -> List[Dict[str, Any]]:
-        """Extracts symbols from source code using tree-sitter queries."""
+    def extract_symbols(ext: str, source_code: Union[str, bytes]) -> List[Dict[str, Any]]:
+        """
+        Extracts symbols from source code using tree-sitter queries.
+
+        Pass the raw UTF-8 file contents as ``bytes`` when available; ``str`` input is encoded once.
+        """
         logger.debug(f"[EXTRACT] Attempting to extract symbols for ext: {ext}")
         symbols: List[Dict[str, Any]] = []
         query = TreeSitterSymbolExtractor.get_query(ext)
@@ -90,7 +124,8 @@ class TreeSitterSymbolExtractor:
             return []
 
         try:
-            tree = parser.parse(bytes(source_code, "utf8"))
+            source_bytes = source_code.encode("utf-8") if isinstance(source_code, str) else source_code
+            tree = parser.parse(source_bytes)
             root = tree.root_node
 
             matches = query.matches(root)
@@ -122,10 +157,7 @@ class TreeSitterSymbolExtractor:
                 else:
                     actual_name_node = node_candidate
 
-                # Now extract symbol name as before
-                symbol_name = (
-                    actual_name_node.text.decode() if hasattr(actual_name_node, "text") else str(actual_name_node)
-                )
+                symbol_name = _node_text(actual_name_node, source_bytes)
                 # HCL: Strip quotes from string literals
                 if ext == ".tf" and hasattr(actual_name_node, "type") and actual_name_node.type == "string_lit":
                     if len(symbol_name) >= 2 and symbol_name.startswith('"') and symbol_name.endswith('"'):
@@ -144,8 +176,8 @@ class TreeSitterSymbolExtractor:
                         if type_node:
                             if isinstance(type_node, list):
                                 type_node = type_node[0] if type_node else None
-                            if type_node and hasattr(type_node, "text"):
-                                type_name = type_node.text.decode()
+                            if type_node:
+                                type_name = _node_text(type_node, source_bytes)
                                 if hasattr(type_node, "type") and type_node.type == "string_lit":
                                     if len(type_name) >= 2 and type_name.startswith('"') and type_name.endswith('"'):
                                         type_name = type_name[1:-1]
@@ -174,18 +206,7 @@ class TreeSitterSymbolExtractor:
                 symbol_start_line = node_for_body_span_and_code.start_point[0]
                 symbol_end_line = node_for_body_span_and_code.end_point[0]
 
-                if hasattr(node_for_body_span_and_code, "text") and isinstance(node_for_body_span_and_code.text, bytes):
-                    symbol_code_content = node_for_body_span_and_code.text.decode("utf-8", errors="ignore")
-                elif hasattr(node_for_body_span_and_code, "start_byte") and hasattr(
-                    node_for_body_span_and_code, "end_byte"
-                ):
-                    # Fallback for nodes where .text might not be the full desired content or not directly available as decodable bytes
-                    symbol_code_content = source_code[
-                        node_for_body_span_and_code.start_byte : node_for_body_span_and_code.end_byte
-                    ]
-                else:
-                    # Last resort, if node_for_body_span_and_code is unusual and lacks .text (bytes) or start/end_byte
-                    symbol_code_content = symbol_name  # Fallback to just the name string
+                symbol_code_content = _node_text(node_for_body_span_and_code, source_bytes)
 
                 symbol = {
                     "name": symbol_name,  # symbol_name is from actual_name_node, potentially modified by HCL logic
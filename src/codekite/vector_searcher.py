@@ -1,21 +1,34 @@
+import hashlib
+import json
 import os
-from typing import List, Dict, Any, Optional
-
-try:
-    import chromadb
-    from chromadb.config import Settings
-except ImportError:
-    chromadb = None  # type: ignore[assignment]
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 from pathlib import Path
 
+import numpy as np
+
+EMBED_BATCH_SIZE = 64  # Texts per embed_fn call when embed_fn accepts a list
+# Embedded once per build_index; its vector identifies the embedding model behind embed_fn
+FINGERPRINT_PROBE = "def codekite_index_fingerprint(): pass"
+# NumpyBackend storage formats: quantization name -> stored dtype
+QUANTIZATIONS: Dict[Optional[str], Any] = {None: np.float32, "float16": np.float16, "int8": np.int8}
+
 
 class VectorDBBackend:
     """
     Abstract vector DB interface for pluggable backends.
     """
 
-    def add(self, embeddings: List[List[float]], metadatas: List[Dict[str, Any]], ids: Optional[List[str]] = None):
+    def add(
+        self,
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+        ids: Optional[List[str]] = None,
+        overwrite: bool = True,
+    ):
+        """Add vectors. With ``overwrite`` (the default) existing vectors are removed first."""
         raise NotImplementedError
 
     def query(self, embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
@@ -31,41 +44,53 @@ class VectorDBBackend:
     def count(self) -> int:
         raise NotImplementedError
 
+    def get_ids(self) -> List[str]:
+        """Return the IDs of all stored vectors. Required for incremental index builds."""
+        raise NotImplementedError
+
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Replace the metadata of existing vectors without re-embedding them."""
+        raise NotImplementedError
+
+    def get_fingerprint(self) -> Optional[Dict[str, Any]]:
+        """Return the fingerprint saved by :meth:`set_fingerprint`, or None if there is none."""
+        return None
+
+    def set_fingerprint(self, fingerprint: Dict[str, Any]):
+        """Record which embedding function produced the stored vectors (str/int values only)."""
+        pass
+
 
 class ChromaDBBackend(VectorDBBackend):
-    def __init__(self, persist_dir: str, collection_name: Optional[str] = None):
-        if chromadb is None:
+    def __init__(self, persist_dir: Optional[str] = None, collection_name: Optional[str] = None):
+        # Imported on first use rather than with the module: chromadb takes most of a second to import,
+        # which every `import codekite` would otherwise pay even when no Chroma index is used.
+        try:
+            import chromadb
+        except ImportError:
             raise ImportError("chromadb is not installed. Run 'pip install chromadb'.")
         self.persist_dir = persist_dir
-        self.client = chromadb.Client(Settings(persist_directory=persist_dir))
-
-        final_collection_name = collection_name
-        if final_collection_name is None:
-            # Use a collection name scoped to persist_dir to avoid dimension clashes across multiple tests/processes
-            final_collection_name = f"kit_code_chunks_{abs(hash(persist_dir))}"
-        self.collection = self.client.get_or_create_collection(final_collection_name)
+        self.collection_name = collection_name or "kit_code_chunks"
+        if persist_dir:
+            # A persistent client stores the index in persist_dir. Chroma shares one System per directory
+            # within a process, so separate directories never share state.
+            self.client = chromadb.PersistentClient(path=persist_dir)
+        else:
+            # Nothing is written to disk; in-memory collections live as long as the process
+            self.client = chromadb.EphemeralClient()
+        self.collection = self.client.get_or_create_collection(self.collection_name)
 
-    def add(self, embeddings, metadatas, ids: Optional[List[str]] = None):
+    def add(self, embeddings, metadatas, ids: Optional[List[str]] = None, overwrite: bool = True):
         # Skip adding if there is nothing to add (prevents ChromaDB error)
-        if not embeddings or not metadatas:
+        if len(embeddings) == 0 or not metadatas:
             return
-        # Clear collection before adding (for index overwrite)
-        # This behavior of clearing the collection on 'add' might need review.
-        # If the goal is to truly overwrite, this is one way. If it's to append
-        # or update, this logic would need to change. For now, assuming overwrite.
-        if self.collection.count() > 0:  # Check if collection has items before deleting
-            try:
-                # Attempt to delete all existing documents. This is a common pattern for a full refresh.
-                # Chroma's API for deleting all can be tricky; using a non-empty ID match is a workaround.
-                # If a more direct `clear()` or `delete_all()` method becomes available, prefer that.
-                self.collection.delete(where={"source": {"$ne": "impossible_source_value_to_match_all"}})  # type: ignore[dict-item]
-                # Or, if you know a common metadata key, like 'file_path' from previous version:
-                # self.collection.delete(where={"file_path": {"$ne": "impossible_file_path"}})
-            except Exception as e:
-                # Log or handle cases where delete might fail or is not supported as expected.
-                # For instance, if the collection was empty, some backends might error on delete-all attempts.
-                # logger.warning(f"Could not clear collection before adding: {e}")
-                pass  # Continue to add, might result in duplicates if not truly cleared.
+        # Clear collection before adding (for index overwrite). Incremental callers pass
+        # overwrite=False together with explicit ids to append to the existing vectors.
+        if overwrite and self.collection.count() > 0:  # Check if collection has items before deleting
+            # Recreate the collection rather than deleting its rows: Chroma fixes a collection's dimension
+            # on the first add, so vectors from a different embedding model would otherwise be rejected.
+            self.client.delete_collection(self.collection_name)
+            self.collection = self.client.get_or_create_collection(self.collection_name)
 
         final_ids = ids
         if final_ids is None:
@@ -106,55 +131,299 @@ class ChromaDBBackend(VectorDBBackend):
             # Some Chroma versions require where filter; fall back to no-op
             pass
 
+    def get_ids(self) -> List[str]:
+        return list(self.collection.get(include=[])["ids"])
+
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        if ids:
+            self.collection.update(ids=ids, metadatas=metadatas)  # type: ignore[arg-type]
+
+    def get_fingerprint(self) -> Optional[Dict[str, Any]]:
+        return dict(self.collection.metadata) if self.collection.metadata else None
+
+    def set_fingerprint(self, fingerprint: Dict[str, Any]):
+        self.collection.modify(metadata=fingerprint)
+
+
+class NumpyBackend(VectorDBBackend):
+    """
+    In-memory backend that scores every stored vector with one matrix product.
+
+    For indexes up to ~100k chunks an exact brute-force search over a contiguous float32 matrix
+    is faster than a round trip through Chroma. Distances are squared L2, like Chroma's default,
+    so ``score`` has the same meaning for both backends. If ``persist_dir`` is set the index is
+    saved there by :meth:`persist` and reloaded on construction.
+
+    ``quantization`` stores vectors as ``"float16"`` (half the memory) or ``"int8"`` with one
+    float32 scale per vector (a quarter). Vectors are dequantized to float32 for scoring; the
+    ranking error this introduces is small for typical code embeddings.
+    """
+
+    def __init__(self, persist_dir: Optional[str] = None, quantization: Optional[str] = None):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization: {quantization}. Choose None, 'float16', or 'int8'.")
+        self.persist_dir = persist_dir
+        self.quantization = quantization
+        self._ids: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._vectors: np.ndarray = np.empty((0, 0), dtype=QUANTIZATIONS[quantization])
+        self._scales: np.ndarray = np.empty(0, dtype=np.float32)
+        self._sq_norms: np.ndarray = np.empty(0, dtype=np.float32)
+        self._fingerprint: Optional[Dict[str, Any]] = None
+        if persist_dir and os.path.exists(os.path.join(persist_dir, "vectors.npy")):
+            # The stored arrays determine the format, whatever quantization this instance was given
+            self._vectors = np.load(os.path.join(persist_dir, "vectors.npy"))
+            self._scales = np.load(os.path.join(persist_dir, "scales.npy"))
+            dense = self._dense()
+            self._sq_norms = np.einsum("nd,nd->n", dense, dense)
+            with open(os.path.join(persist_dir, "metadata.json"), "r", encoding="utf-8") as fp:
+                stored = json.load(fp)
+            self._ids, self._metadatas = stored["ids"], stored["metadatas"]
+            self._fingerprint = stored.get("fingerprint")
+
+    def _quantize(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns ``(stored_vectors, scales)`` for float32 ``vectors``."""
+        if self._vectors.dtype == np.int8:
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+            return codes, scales.astype(np.float32)
+        return vectors.astype(self._vectors.dtype), np.ones(len(vectors), dtype=np.float32)
+
+    def _dense(self) -> np.ndarray:
+        """Returns the stored vectors as a float32 matrix."""
+        dense = self._vectors.astype(np.float32)
+        if self._vectors.dtype == np.int8:
+            dense *= self._scales[:, None]
+        return dense
+
+    def add(self, embeddings, metadatas, ids: Optional[List[str]] = None, overwrite: bool = True):
+        if len(embeddings) == 0 or not metadatas:
+            return
+        final_ids = ids
+        if final_ids is None:
+            final_ids = [str(i) for i in range(len(metadatas))]
+        elif len(final_ids) != len(embeddings):
+            raise ValueError("The number of IDs must match the number of embeddings and metadatas.")
+        codes, scales = self._quantize(np.asarray(embeddings, dtype=np.float32))
+        if overwrite or not self._ids:
+            self._ids, self._metadatas = [], []
+            self._vectors, self._scales = codes[:0], scales[:0]
+        self._ids.extend(final_ids)
+        self._metadatas.extend(dict(m) for m in metadatas)
+        self._vectors = np.vstack([self._vectors, codes])
+        self._scales = np.concatenate([self._scales, scales])
+        dense = self._dense()
+        self._sq_norms = np.einsum("nd,nd->n", dense, dense)
+
+    def query(self, embedding, top_k):
+        if top_k <= 0 or not self._ids:
+            return []
+        q = np.asarray(embedding, dtype=np.float32)
+        # ||d - q||^2 = ||d||^2 - 2 d.q + ||q||^2, with d.q computed for all rows in one BLAS call
+        if self._vectors.dtype == np.float32:
+            dots = self._vectors @ q
+        else:
+            dots = (self._vectors.astype(np.float32) @ q) * self._scales
+        distances = self._sq_norms - 2.0 * dots + float(q @ q)
+        k = min(top_k, len(self._ids))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        hits = []
+        for i in nearest:
+            meta = dict(self._metadatas[i])
+            meta["score"] = float(distances[i])
+            hits.append(meta)
+        return hits
+
+    def persist(self):
+        if not self.persist_dir:
+            return
+        os.makedirs(self.persist_dir, exist_ok=True)
+        np.save(os.path.join(self.persist_dir, "vectors.npy"), self._vectors)
+        np.save(os.path.join(self.persist_dir, "scales.npy"), self._scales)
+        with open(os.path.join(self.persist_dir, "metadata.json"), "w", encoding="utf-8") as fp:
+            json.dump({"ids": self._ids, "metadatas": self._metadatas, "fingerprint": self._fingerprint}, fp)
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def delete(self, ids: List[str]):
+        if not ids:
+            return
+        to_delete = set(ids)
+        keep = [i for i, vector_id in enumerate(self._ids) if vector_id not in to_delete]
+        self._ids = [self._ids[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._vectors = self._vectors[keep]
+        self._scales = self._scales[keep]
+        self._sq_norms = self._sq_norms[keep]
+
+    def get_ids(self) -> List[str]:
+        return list(self._ids)
+
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        positions = {vector_id: i for i, vector_id in enumerate(self._ids)}
+        for vector_id, meta in zip(ids, metadatas):
+            if vector_id in positions:
+                self._metadatas[positions[vector_id]] = dict(meta)
+
+    def get_fingerprint(self) -> Optional[Dict[str, Any]]:
+        return dict(self._fingerprint) if self._fingerprint else None
+
+    def set_fingerprint(self, fingerprint: Dict[str, Any]):
+        self._fingerprint = dict(fingerprint)
+
 
 class VectorSearcher:
     def __init__(self, repo, embed_fn, backend: Optional[VectorDBBackend] = None, persist_dir: Optional[str] = None):
         self.repo = repo
         self.embed_fn = embed_fn  # Function: str -> List[float]
-        self.persist_dir = persist_dir or os.path.join(".codekite", "vector_db")
-        self.backend = backend or ChromaDBBackend(self.persist_dir)
+        # The index is kept in memory unless persist_dir is given. In-memory collections share one Chroma
+        # System per process, so each searcher gets its own; a persisted index is named after the repository.
+        self.persist_dir = persist_dir
+        collection_name = _collection_name(repo) if persist_dir else f"kit_code_chunks_{uuid.uuid4().hex}"
+        self.backend = backend or ChromaDBBackend(self.persist_dir, collection_name=collection_name)
         self.chunk_metadatas: List[Dict[str, Any]] = []
-        self.chunk_embeddings: List[List[float]] = []
+        # float32 matrix of the vectors computed by the last build_index, one row per ID in chunk_embedding_ids.
+        # After an incremental build these are only the new or changed chunks, not the whole index.
+        self.chunk_embeddings: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self.chunk_embedding_ids: List[str] = []
+        # None until the first build_index call shows whether embed_fn accepts a list of texts
+        self._embed_fn_batches: Optional[bool] = None
 
     def build_index(self, chunk_by: str = "symbols"):
-        self.chunk_metadatas = []
-        chunk_codes: List[str] = []
+        """
+        Chunk every file, embed the chunks, and store them in the backend.
 
+        Each chunk is stored under an ID derived from its file path and code, so rebuilding only
+        embeds chunks that are new or changed and deletes chunks that no longer exist. The backend
+        also stores a fingerprint of the embedding model (a hash of ``embed_fn``'s vector for a fixed
+        probe text, and its dimension); when ``embed_fn`` no longer reproduces it, or when the backend
+        does not implement ``get_ids`` or fingerprints, the index is rebuilt from scratch.
+        """
+        chunks = _ChunkBatch()
         for file in self.repo.get_file_tree():
             if file["is_dir"]:
                 continue
             path = file["path"]
             if chunk_by == "symbols":
-                chunks = self.repo.chunk_file_by_symbols(path)
-                for chunk in chunks:
-                    code = chunk["code"]
-                    self.chunk_metadatas.append({"file": path, **chunk})
-                    chunk_codes.append(code)
+                for chunk in self.repo.chunk_file_by_symbols(path):
+                    chunks.append(chunk["code"], {"file": path, **chunk})
             else:
-                chunks = self.repo.chunk_file_by_lines(path, max_lines=50)
-                for code in chunks:
-                    self.chunk_metadatas.append({"file": path, "code": code})
-                    chunk_codes.append(code)
-
-        # Embed in batch (attempt). Fallback to per-item if embed_fn doesn't support list input.
-        if chunk_codes:
-            self.chunk_embeddings = self._batch_embed(chunk_codes)
-            self.backend.add(self.chunk_embeddings, self.chunk_metadatas)
-            self.backend.persist()
+                for code in self.repo.chunk_file_by_lines(path, max_lines=50):
+                    chunks.append(code, {"file": path, "code": code})
+        self.chunk_metadatas = chunks.metadatas
 
-    def _batch_embed(self, texts: List[str]) -> List[List[float]]:
-        """Embed a list of texts, falling back to per-item calls if necessary."""
+        fingerprint = self._fingerprint()
         try:
-            bulk = self.embed_fn(texts)  # type: ignore[arg-type]
-            if isinstance(bulk, list) and len(bulk) == len(texts) and all(isinstance(v, (list, tuple)) for v in bulk):
-                return [list(map(float, v)) for v in bulk]  # ensure list of list[float]
-        except Exception:
-            pass  # Fall back to per-item
+            existing_ids = set(self.backend.get_ids())
+        except NotImplementedError:
+            self._rebuild(chunks, fingerprint)
+            return
+        stored = self.backend.get_fingerprint() or {}
+        if existing_ids and {key: stored.get(key) for key in fingerprint} != fingerprint:
+            # Stored vectors came from another model (or cannot be verified) and are not comparable
+            self._rebuild(chunks, fingerprint)
+            return
+
+        fresh, kept = chunks.partition(existing_ids)
+        # Only chunks that are new since the last build are embedded
+        self.chunk_embeddings = self._batch_embed(fresh.codes)
+        self.chunk_embedding_ids = fresh.ids
+
+        removed_ids = existing_ids.difference(chunks.ids)
+        if removed_ids:
+            self.backend.delete(ids=list(removed_ids))
+        if kept.ids:
+            # Unchanged code may still have moved within its file; refresh line numbers without re-embedding
+            self.backend.update_metadatas(kept.ids, kept.metadatas)
+        if fresh.ids:
+            self.backend.add(self.chunk_embeddings.tolist(), fresh.metadatas, ids=fresh.ids, overwrite=False)
+            self.backend.set_fingerprint(fingerprint)
+        if removed_ids or chunks.ids:
+            self.backend.persist()
+
+    def _rebuild(self, chunks: "_ChunkBatch", fingerprint: Dict[str, Any]):
+        """Embed every chunk and let the backend overwrite its contents."""
+        self.chunk_embeddings = self._batch_embed(chunks.codes)
+        self.chunk_embedding_ids = chunks.ids
+        if chunks.ids:
+            self.backend.add(self.chunk_embeddings.tolist(), chunks.metadatas, ids=chunks.ids)
+            self.backend.set_fingerprint(fingerprint)
+            self.backend.persist()
+
+    def _fingerprint(self) -> Dict[str, Any]:
+        """Identifies the model behind embed_fn by hashing its vector for FINGERPRINT_PROBE."""
+        probe = np.asarray(self.embed_fn(FINGERPRINT_PROBE), dtype=np.float32).ravel()
+        # Rounding absorbs run-to-run float noise; adding 0.0 turns -0.0 into 0.0 so both hash alike
+        digest = hashlib.blake2b((np.round(probe, 4) + 0.0).tobytes(), digest_size=16).hexdigest()
+        return {"embed": digest, "dim": int(probe.shape[0])}
+
+    def _batch_embed(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+        """Embed texts in sub-batches of ``batch_size`` into one float32 ``(len(texts), dim)`` matrix."""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(
+            [self._vectorize(texts[start : start + batch_size]) for start in range(0, len(texts), batch_size)]
+        )
+
+    def _vectorize(self, texts: List[str]) -> np.ndarray:
+        """Embed one sub-batch, with a single ``embed_fn`` call when ``embed_fn`` accepts a list."""
+        if self._embed_fn_batches is not False:
+            try:
+                # Accepts lists of lists as well as 2-D numpy arrays (e.g. SentenceTransformer.encode)
+                bulk = np.asarray(self.embed_fn(texts), dtype=np.float32)  # type: ignore[arg-type]
+                if bulk.ndim == 2 and bulk.shape[0] == len(texts):
+                    self._embed_fn_batches = True
+                    return bulk
+            except Exception:
+                pass  # Fall back to per-item
+            # Remember that embed_fn only takes single strings so later sub-batches skip the bulk attempt
+            self._embed_fn_batches = False
         # Fallback slow path
-        return [self.embed_fn(t) for t in texts]
+        return np.asarray([self.embed_fn(t) for t in texts], dtype=np.float32)
 
     def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         if top_k <= 0:
             return []
         emb = self.embed_fn(query)
         return self.backend.query(emb, top_k)
+
+
+def _collection_name(repo) -> str:
+    """Returns a Chroma collection name unique to the repository root, so repositories never share an index."""
+    root = str(getattr(repo, "local_path", ""))
+    return f"kit_code_chunks_{hashlib.blake2b(root.encode('utf-8'), digest_size=8).hexdigest()}"
+
+
+@dataclass
+class _ChunkBatch:
+    """
+    Chunks of one build_index call as parallel lists (ID, code, metadata), filled in a single walk.
+
+    IDs are a hash of file path and code, suffixed when a file repeats a chunk.
+    """
+
+    ids: List[str] = field(default_factory=list)
+    codes: List[str] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+    _seen: Dict[str, int] = field(default_factory=dict)
+
+    def append(self, code: str, metadata: Dict[str, Any]) -> None:
+        digest = hashlib.blake2b(f"{metadata['file']}\0{code}".encode("utf-8"), digest_size=16).hexdigest()
+        occurrence = self._seen.get(digest, 0)
+        self._seen[digest] = occurrence + 1
+        self.ids.append(digest if occurrence == 0 else f"{digest}-{occurrence}")
+        self.codes.append(code)
+        self.metadatas.append(metadata)
+
+    def partition(self, existing_ids: Set[str]) -> Tuple["_ChunkBatch", "_ChunkBatch"]:
+        """Splits into ``(chunks not in existing_ids, chunks in existing_ids)`` in one pass."""
+        fresh, kept = _ChunkBatch(), _ChunkBatch()
+        for chunk_id, code, metadata in zip(self.ids, self.codes, self.metadatas):
+            target = kept if chunk_id in existing_ids else fresh
+            target.ids.append(chunk_id)
+            target.codes.append(code)
+            target.metadatas.append(metadata)
+        return fresh, kept
@@ -0,0 +1,11 @@
+import pytest
+
+from codekite.tree_sitter_symbol_extractor import TreeSitterSymbolExtractor
+
+
+@pytest.fixture(scope="session")
+def _warm_parsers():
+    # Load every grammar and compile its tags query once per session (once per worker under xdist),
+    # so the first test to touch a language does not pay that cost inside its own timing. Requested
+    # only by modules that exercise many languages; other runs skip the preload.
+    TreeSitterSymbolExtractor.preload()
@@ -1,6 +1,7 @@
 import tempfile
 import os
 from codekite import CodeSearcher
+from codekite.code_searcher import SearchOptions
 
 def test_search_text_basic():
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -37,3 +38,68 @@ def test_search_text_regex():
         matches = searcher.search_text(r"def [fb]oo")
         assert any("foo" in m["line"] for m in matches)
         assert not any("bar" in m["line"] for m in matches)
+
+def test_search_text_context_lines():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "foo.py"), "w") as f:
+            f.write("a\nhit1\nb\nhit2\nc\nd\n")
+        searcher = CodeSearcher(tmpdir)
+        options = SearchOptions(context_lines_before=2, context_lines_after=2)
+        matches = searcher.search_text("hit", options=options)
+        assert [m["line_number"] for m in matches] == [2, 4]
+        assert matches[0]["context_before"] == ["a"]
+        assert matches[0]["context_after"] == ["b", "hit2"]
+        assert matches[1]["context_before"] == ["hit1", "b"]
+        assert matches[1]["context_after"] == ["c", "d"]
+
+def test_search_text_literal_and_case_insensitive():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "foo.py"), "w") as f:
+            f.write("Foo = 1\nfoo = 2\nbar = 3\n")
+        searcher = CodeSearcher(tmpdir)
+        assert [m["line_number"] for m in searcher.search_text("foo =")] == [2]
+        options = SearchOptions(case_sensitive=False)
+        assert [m["line_number"] for m in searcher.search_text("foo =", options=options)] == [1, 2]
+        assert [m["line_number"] for m in searcher.search_text("[fb]", options=options)] == [1, 2, 3]
+
+def test_search_text_walks_like_rglob():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, "pkg", "sub"))
+        os.makedirs(os.path.join(tmpdir, "dir.py"))
+        for rel in ["top.py", "pkg/a.py", "pkg/sub/b.py", "pkg/notes.txt"]:
+            with open(os.path.join(tmpdir, rel), "w") as f:
+                f.write("needle\n")
+        searcher = CodeSearcher(tmpdir)
+        assert sorted(m["file"] for m in searcher.search_text("needle")) == ["pkg/a.py", "pkg/sub/b.py", "top.py"]
+        assert [m["file"] for m in searcher.search_text("needle", file_pattern="sub/*.py")] == ["pkg/sub/b.py"]
+        assert len(searcher.search_text("needle", file_pattern="*")) == 4
+        # "**" spans zero or more directories, so top-level files match too
+        assert sorted(m["file"] for m in searcher.search_text("needle", file_pattern="**/*.py")) == [
+            "pkg/a.py",
+            "pkg/sub/b.py",
+            "top.py",
+        ]
+        assert [m["file"] for m in searcher.search_text("needle", file_pattern="pkg/**/b.py")] == ["pkg/sub/b.py"]
+        assert [m["file"] for m in searcher.search_text("needle", file_pattern="pkg/**/a.py")] == ["pkg/a.py"]
+
+def test_search_text_prunes_gitignored_dirs():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, ".gitignore"), "w") as f:
+            f.write("node_modules/\nbuild\n")
+        for rel in ["node_modules/dep/x.py", "build/y.py", ".git/hooks/z.py", "src/keep.py"]:
+            os.makedirs(os.path.dirname(os.path.join(tmpdir, rel)), exist_ok=True)
+            with open(os.path.join(tmpdir, rel), "w") as f:
+                f.write("needle\n")
+        searcher = CodeSearcher(tmpdir)
+        assert [m["file"] for m in searcher.search_text("needle")] == ["src/keep.py"]
+        unfiltered = searcher.search_text("needle", options=SearchOptions(use_gitignore=False))
+        assert len(unfiltered) == 4
+
+def test_search_text_skips_binary_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "blob.bin"), "wb") as f:
+            f.write(b"\x00\x01needle\n")
+        with open(os.path.join(tmpdir, "text.txt"), "w") as f:
+            f.write("needle\r\nnext\n")
+        matches = CodeSearcher(tmpdir).search_text("needle", file_pattern="*")
+        assert [(m["file"], m["line"]) for m in matches] == [("text.txt", "needle")]
@@ -4,6 +4,8 @@ import pytest
 import asyncio
 from codekite import Repository
 
+pytestmark = pytest.mark.usefixtures("_warm_parsers")
+
 # Helper to run extraction
 def run_extraction(tmpdir, filename, content):
     path = os.path.join(tmpdir, filename)
@@ -74,3 +74,45 @@ def test_repo_get_file_content():
         # Test 4: Attempt to read content from a directory (should also fail)
         with pytest.raises(IOError): # Or perhaps FileNotFoundError or IsADirectoryError, adjust as per actual behavior
             repository.get_file_content("dir1")
+
+def test_repo_extract_symbols_bulk():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = [f"pkg/mod_{i}.py" for i in range(40)]
+        os.makedirs(f"{tmpdir}/pkg")
+        for i, relpath in enumerate(paths):
+            with open(os.path.join(tmpdir, relpath), "w") as f:
+                f.write(f"class C{i}:\n    pass\n\ndef f{i}(): pass\n")
+        repository = Repository(tmpdir)
+
+        bulk = repository.extract_symbols_bulk(paths, max_workers=4)
+
+        assert list(bulk) == paths
+        for relpath in paths:
+            assert bulk[relpath] == repository.extract_symbols(relpath)
+        assert {s["name"] for s in bulk["pkg/mod_7.py"]} == {"C7", "f7"}
+
+def test_repo_extract_symbols_bulk_small_input_stays_in_process(monkeypatch):
+    import codekite.repository as repository_module
+
+    def no_processes(*args, **kwargs):
+        raise AssertionError("worker processes should not be started")
+
+    monkeypatch.setattr(repository_module, "ProcessPoolExecutor", no_processes)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "one.py"), "w") as f:
+            f.write("def one(): pass\n")
+        repository = Repository(tmpdir)
+        assert repository.extract_symbols_bulk(["one.py"], max_workers=8) == {
+            "one.py": repository.extract_symbols("one.py")
+        }
+
+def test_clone_github_repo_is_shallow(monkeypatch):
+    import subprocess
+
+    calls = []
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kwargs: calls.append(cmd))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        Repository("https://github.com/example/project", cache_dir=cache_dir)
+    clone_cmd = calls[0]
+    assert clone_cmd[:2] == ["git", "clone"]
+    assert {"--depth=1", "--single-branch", "--no-tags"} <= set(clone_cmd)
@@ -31,3 +31,17 @@ def baz(): pass
         types = {s["type"] for s in symbols}
         assert "class" in types
         assert "function" in types
+
+def test_get_file_tree_skips_ignored_dirs():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        import os
+        for rel in ["node_modules/dep/index.js", ".git/HEAD", "src/app.py"]:
+            os.makedirs(os.path.dirname(f"{tmpdir}/{rel}"), exist_ok=True)
+            with open(f"{tmpdir}/{rel}", "w") as f:
+                f.write("x\n")
+        with open(f"{tmpdir}/.gitignore", "w") as f:
+            f.write("node_modules/\n")
+        paths = {item["path"] for item in RepoMapper(tmpdir).get_file_tree()}
+        assert "src/app.py" in paths
+        assert not any(p.startswith(".git") and p != ".gitignore" for p in paths)
+        assert not any(p.startswith("node_modules/") for p in paths)
@@ -1,8 +1,8 @@
 import pytest
-import re
+import asyncio
 import os
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from codekite.summaries import (
     Summarizer,
@@ -21,26 +21,37 @@ import types
 # ---------------------------------------------------------
 # Ensure external SDKs are importable even if not installed
 # ---------------------------------------------------------
-if 'openai' not in sys.modules:
+def _make_sdk_stubs():
+    """Build placeholder modules for the provider SDKs used by Summarizer."""
     openai_dummy = types.ModuleType('openai')
     openai_dummy.OpenAI = MagicMock() # type: ignore[attr-defined]
-    sys.modules['openai'] = openai_dummy
-
-if 'anthropic' not in sys.modules:
     anthropic_dummy = types.ModuleType('anthropic')
     anthropic_dummy.Anthropic = MagicMock() # type: ignore[attr-defined]
-    sys.modules['anthropic'] = anthropic_dummy
-
-if 'google' not in sys.modules:
-    google_dummy = types.ModuleType('google')
-    sys.modules['google'] = google_dummy
-
-if 'google.genai' not in sys.modules:
     genai_dummy = types.ModuleType('genai')
     genai_dummy.Client = MagicMock() # type: ignore[attr-defined]
-    sys.modules['google.genai'] = genai_dummy
-    # Attach submodule to parent "google"
-    sys.modules['google'].genai = genai_dummy # type: ignore[attr-defined]
+    google_dummy = types.ModuleType('google')
+    google_dummy.genai = genai_dummy # type: ignore[attr-defined]
+    return {
+        'openai': openai_dummy,
+        'anthropic': anthropic_dummy,
+        'google': google_dummy,
+        'google.genai': genai_dummy,
+    }
+
+_sdk_stubs = {k: v for k, v in _make_sdk_stubs().items() if k not in sys.modules}
+sys.modules.update(_sdk_stubs)
+if 'google.genai' in _sdk_stubs:
+    # Attach submodule to parent "google", which may be a real namespace package already imported
+    sys.modules['google'].genai = _sdk_stubs['google.genai'] # type: ignore[attr-defined]
+
+# The stubs above live in process-wide sys.modules, so keep every test in this
+# file on one xdist worker (honoured by --dist=loadgroup). Each worker, and each
+# --forked child, re-imports this module and installs its own stubs.
+pytestmark = pytest.mark.xdist_group(name="summaries_sdk_stubs")
+
+def _symbol(name, kind, code):
+    """Return a single-symbol list shaped like Repository.extract_symbols output."""
+    return [{"name": name, "type": kind, "code": code}]
 
 # --- Fixtures ---
 
@@ -278,8 +289,9 @@ def test_summarize_file_not_found(mock_repo):
     
     # The error message re-raised by summarize_file will include 'File not found via repo: '
     expected_error_message = f"File not found via repo: {abs_path_to_non_existent_file}"
-    with pytest.raises(FileNotFoundError, match=re.escape(expected_error_message)):
+    with pytest.raises(FileNotFoundError) as exc_info:
         summarizer.summarize_file("non_existent.py")
+    assert str(exc_info.value).startswith(expected_error_message)
     
     mock_repo.get_abs_path.assert_called_once_with("non_existent.py")
     mock_repo.get_file_content.assert_called_once_with(abs_path_to_non_existent_file)
@@ -296,8 +308,9 @@ def test_summarize_file_llm_error_empty_summary(mock_openai_constructor, mock_re
 
     config = OpenAIConfig(api_key="test_key")
     summarizer = Summarizer(repo=mock_repo, config=config)
-    with pytest.raises(LLMError, match="LLM returned an empty summary."):
+    with pytest.raises(LLMError) as exc_info:
         summarizer.summarize_file(temp_code_file)
+    assert "LLM returned an empty summary" in str(exc_info.value)
 
 @patch('openai.OpenAI', create=True)
 def test_summarize_file_llm_api_error(mock_openai_constructor, mock_repo, temp_code_file):
@@ -309,8 +322,9 @@ def test_summarize_file_llm_api_error(mock_openai_constructor, mock_repo, temp_c
 
     config = OpenAIConfig(api_key="test_key")
     summarizer = Summarizer(repo=mock_repo, config=config)
-    with pytest.raises(LLMError, match="Error communicating with LLM API: API Down"):
+    with pytest.raises(LLMError) as exc_info:
         summarizer.summarize_file(temp_code_file)
+    assert str(exc_info.value).startswith("Error communicating with LLM API: API Down")
 
 @patch('anthropic.Anthropic', create=True) # Mock Anthropic client
 def test_summarize_file_anthropic(mock_anthropic_constructor, mock_repo, temp_code_file):
@@ -395,11 +409,7 @@ def test_summarize_file_google(mock_google_client_constructor, mock_repo, temp_c
 def test_summarize_function_openai(mock_openai_constructor, mock_repo):
     """Test summarize_function with OpenAIConfig."""
     mock_func_code = "def my_func(a, b):\n    return a + b"
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "my_func",
-        "type": "FUNCTION",
-        "code": mock_func_code
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("my_func", "FUNCTION", mock_func_code)
 
     # Mock the OpenAI client and its response
     mock_openai_client = MagicMock()
@@ -437,17 +447,14 @@ def test_summarize_function_not_found(mock_repo):
     mock_repo.extract_symbols.return_value = [] # Simulate symbol not found
     config = OpenAIConfig(api_key="test_key") # Can use any config for this test
     summarizer = Summarizer(repo=mock_repo, config=config)
-    with pytest.raises(ValueError, match="Could not find function 'non_existent_func' in 'some_file.py'."):
+    with pytest.raises(ValueError) as exc_info:
         summarizer.summarize_function("some_file.py", "non_existent_func")
+    assert str(exc_info.value) == "Could not find function 'non_existent_func' in 'some_file.py'."
 
 @patch('openai.OpenAI', create=True)
 def test_summarize_function_llm_error_empty_summary(mock_openai_constructor, mock_repo):
     """Test summarize_function raises LLMError if LLM returns an empty summary."""
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "my_func_empty",
-        "type": "FUNCTION",
-        "code": "def f(): pass"
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("my_func_empty", "FUNCTION", "def f(): pass")
     mock_openai_client = MagicMock()
     mock_response = MagicMock()
     mock_response.choices[0].message.content = "" # Empty summary
@@ -456,35 +463,29 @@ def test_summarize_function_llm_error_empty_summary(mock_openai_constructor, moc
 
     config = OpenAIConfig(api_key="test_key")
     summarizer = Summarizer(repo=mock_repo, config=config)
-    with pytest.raises(LLMError, match="LLM returned an empty summary for function my_func_empty."):
+    with pytest.raises(LLMError) as exc_info:
         summarizer.summarize_function("file.py", "my_func_empty")
+    assert "LLM returned an empty summary for function my_func_empty." in str(exc_info.value)
 
 @patch('openai.OpenAI', create=True)
 def test_summarize_function_llm_api_error(mock_openai_constructor, mock_repo):
     """Test summarize_function raises LLMError on API communication failure."""
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "my_func_api_err",
-        "type": "FUNCTION",
-        "code": "def f(): pass"
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("my_func_api_err", "FUNCTION", "def f(): pass")
     mock_openai_client = MagicMock()
     mock_openai_client.chat.completions.create.side_effect = Exception("API Error")
     mock_openai_constructor.return_value = mock_openai_client
 
     config = OpenAIConfig(api_key="test_key")
     summarizer = Summarizer(repo=mock_repo, config=config)
-    with pytest.raises(LLMError, match="Error communicating with LLM API for function my_func_api_err: API Error"):
+    with pytest.raises(LLMError) as exc_info:
         summarizer.summarize_function("file.py", "my_func_api_err")
+    assert str(exc_info.value).startswith("Error communicating with LLM API for function my_func_api_err: API Error")
 
 @patch('anthropic.Anthropic', create=True) # Mock Anthropic client
 def test_summarize_function_anthropic(mock_anthropic_constructor, mock_repo):
     """Test summarize_function with AnthropicConfig."""
     mock_func_code = "def greet(name: str) -> str:\n    return f'Hello, {name}'"
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "greet",
-        "type": "FUNCTION",
-        "code": mock_func_code
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("greet", "FUNCTION", mock_func_code)
 
     mock_anthropic_client = MagicMock()
     mock_response = MagicMock()
@@ -523,11 +524,7 @@ def test_summarize_function_google(mock_google_client_constructor, mock_repo):
         pytest.skip("google.genai not available to codekite.summaries")
 
     mock_func_code = "def calculate_sum(numbers: list[int]) -> int:\n    return sum(numbers)"
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "calculate_sum",
-        "type": "FUNCTION",
-        "code": mock_func_code
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("calculate_sum", "FUNCTION", mock_func_code)
 
     mock_google_client_instance = MagicMock()
     mock_response = MagicMock()
@@ -569,11 +566,7 @@ def test_summarize_function_google(mock_google_client_constructor, mock_repo):
 def test_summarize_class_openai(mock_openai_constructor, mock_repo):
     """Test summarize_class with OpenAIConfig."""
     mock_class_code = "class MyClass:\n    def __init__(self, x):\n        self.x = x\n\n    def get_x(self):\n        return self.x"
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "MyClass",
-        "type": "CLASS",
-        "code": mock_class_code
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("MyClass", "CLASS", mock_class_code)
 
     # Mock the OpenAI client and its response
     mock_openai_client = MagicMock()
@@ -611,17 +604,14 @@ def test_summarize_class_not_found(mock_repo):
     mock_repo.extract_symbols.return_value = [] # Simulate symbol not found
     config = OpenAIConfig(api_key="test_key") # Can use any config
     summarizer = Summarizer(repo=mock_repo, config=config)
-    with pytest.raises(ValueError, match="Could not find class 'NonExistentClass' in 'another_file.py'."):
+    with pytest.raises(ValueError) as exc_info:
         summarizer.summarize_class("another_file.py", "NonExistentClass")
+    assert str(exc_info.value) == "Could not find class 'NonExistentClass' in 'another_file.py'."
 
 @patch('openai.OpenAI', create=True)
 def test_summarize_class_llm_error_empty_summary(mock_openai_constructor, mock_repo):
     """Test summarize_class raises LLMError if LLM returns an empty summary."""
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "MyClass_empty",
-        "type": "CLASS",
-        "code": "class C: pass"
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("MyClass_empty", "CLASS", "class C: pass")
     mock_openai_client = MagicMock()
     mock_response = MagicMock()
     mock_response.choices[0].message.content = "" # Empty summary
@@ -630,35 +620,29 @@ def test_summarize_class_llm_error_empty_summary(mock_openai_constructor, mock_r
 
     config = OpenAIConfig(api_key="test_key")
     summarizer = Summarizer(repo=mock_repo, config=config)
-    with pytest.raises(LLMError, match="LLM returned an empty summary for class MyClass_empty."):
+    with pytest.raises(LLMError) as exc_info:
         summarizer.summarize_class("file.py", "MyClass_empty")
+    assert "LLM returned an empty summary for class MyClass_empty." in str(exc_info.value)
 
 @patch('openai.OpenAI', create=True)
 def test_summarize_class_llm_api_error(mock_openai_constructor, mock_repo):
     """Test summarize_class raises LLMError on API communication failure."""
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "MyClass_api_err",
-        "type": "CLASS",
-        "code": "class C: pass"
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("MyClass_api_err", "CLASS", "class C: pass")
     mock_openai_client = MagicMock()
     mock_openai_client.chat.completions.create.side_effect = Exception("API Crash")
     mock_openai_constructor.return_value = mock_openai_client
 
     config = OpenAIConfig(api_key="test_key")
     summarizer = Summarizer(repo=mock_repo, config=config)
-    with pytest.raises(LLMError, match="Error communicating with LLM API for class MyClass_api_err: API Crash"):
+    with pytest.raises(LLMError) as exc_info:
         summarizer.summarize_class("file.py", "MyClass_api_err")
+    assert str(exc_info.value).startswith("Error communicating with LLM API for class MyClass_api_err: API Crash")
 
 @patch('anthropic.Anthropic', create=True) # Mock Anthropic client
 def test_summarize_class_anthropic(mock_anthropic_constructor, mock_repo):
     """Test summarize_class with AnthropicConfig."""
     mock_class_code = "class DataProcessor:\n    def __init__(self, data):\n        self.data = data\n\n    def process(self):\n        return len(self.data)"
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "DataProcessor",
-        "type": "CLASS",
-        "code": mock_class_code
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("DataProcessor", "CLASS", mock_class_code)
 
     mock_anthropic_client = MagicMock()
     mock_response = MagicMock()
@@ -696,11 +680,7 @@ def test_summarize_class_google(mock_google_client_constructor, mock_repo):
     if kit_s_genai is None:
         pytest.skip("google.genai not available to codekite.summaries")
     mock_class_code = "class Logger:\n    def __init__(self, level='INFO'):\n        self.level = level\n\n    def log(self, message):\n        print(f'[{self.level}] {message}')"
-    mock_repo.extract_symbols.return_value = [{ 
-        "name": "Logger",
-        "type": "CLASS",
-        "code": mock_class_code
-    }]
+    mock_repo.extract_symbols.return_value = _symbol("Logger", "CLASS", mock_class_code)
 
     mock_google_client_instance = MagicMock()
     mock_response = MagicMock()
@@ -735,4 +715,164 @@ def test_summarize_class_google(mock_google_client_constructor, mock_repo):
 
     assert summary == "This is a Google class summary."
 
+# --- Test summarize_batch ---
+
+@patch('openai.OpenAI', create=True)
+def test_summarize_batch_openai_single_request(mock_openai_constructor, mock_repo):
+    """Test summarize_batch sends files and symbols in one JSON-mode request and keeps item order."""
+    mock_repo.get_file_content.return_value = "print('hi')"
+    mock_repo.extract_symbols.return_value = _symbol("MyClass", "CLASS", "class MyClass: pass")
+
+    mock_openai_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = (
+        '{"summaries": [{"i": 1, "summary": "Class summary."}, {"i": 0, "summary": "File summary."}]}'
+    )
+    mock_openai_client.chat.completions.create.return_value = mock_response
+    mock_openai_constructor.return_value = mock_openai_client
+
+    config = OpenAIConfig(api_key="test_openai_key", model="gpt-batch-test")
+    summarizer = Summarizer(repo=mock_repo, config=config)
+
+    summaries = summarizer.summarize_batch([("app.py", None), ("models.py", "MyClass")])
+
+    assert summaries == ["File summary.", "Class summary."]
+    mock_openai_client.chat.completions.create.assert_called_once()
+    call_kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert call_kwargs["response_format"] == {"type": "json_object"}
+    user_prompt = call_kwargs["messages"][1]["content"]
+    assert "<<<ITEM 0>>> file 'app.py'" in user_prompt
+    assert "<<<ITEM 1>>> class 'MyClass' from the file 'models.py'" in user_prompt
+
+@patch.object(Summarizer, "_get_tokenizer", return_value=None)
+@patch('openai.OpenAI', create=True)
+def test_summarize_batch_respects_batch_size(mock_openai_constructor, mock_get_tokenizer, mock_repo):
+    """Test summarize_batch issues one request per batch_size items."""
+    mock_repo.get_file_content.return_value = "x = 1"
+    mock_openai_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = '{"summaries": [{"i": 0, "summary": "A"}, {"i": 1, "summary": "B"}]}'
+    mock_openai_client.chat.completions.create.return_value = mock_response
+    mock_openai_constructor.return_value = mock_openai_client
+
+    summarizer = Summarizer(repo=mock_repo, config=OpenAIConfig(api_key="test_key"))
+    summaries = summarizer.summarize_batch([(f"f{i}.py", None) for i in range(4)], batch_size=2)
+
+    assert summaries == ["A", "B", "A", "B"]
+    assert mock_openai_client.chat.completions.create.call_count == 2
+
+@patch.object(Summarizer, "_get_tokenizer", return_value=None)
+@patch('openai.OpenAI', create=True)
+def test_summarize_batch_falls_back_for_missing_items(mock_openai_constructor, mock_get_tokenizer, mock_repo):
+    """Test items missing from the batch reply are summarized with an individual request."""
+    mock_repo.extract_symbols.return_value = _symbol("my_func", "FUNCTION", "def my_func(): pass")
+    mock_openai_client = MagicMock()
+    batch_response = MagicMock()
+    batch_response.choices[0].message.content = "not json"
+    single_response = MagicMock()
+    single_response.choices[0].message.content = "Single summary."
+    mock_openai_client.chat.completions.create.side_effect = [batch_response, single_response]
+    mock_openai_constructor.return_value = mock_openai_client
+
+    summarizer = Summarizer(repo=mock_repo, config=OpenAIConfig(api_key="test_key"))
+    summaries = summarizer.summarize_batch([("file.py", "my_func")])
+
+    assert summaries == ["Single summary."]
+    assert mock_openai_client.chat.completions.create.call_count == 2
+    assert "response_format" not in mock_openai_client.chat.completions.create.call_args.kwargs
+
+@patch('google.genai.Client', create=True)
+def test_summarize_batch_google_json_mime_type(mock_google_client_constructor, mock_repo):
+    """Test summarize_batch asks Gemini for a JSON response."""
+    if kit_s_genai is None:
+        pytest.skip("google.genai not available to codekite.summaries")
+    mock_repo.get_file_content.return_value = "x = 1"
+    mock_google_client_instance = MagicMock()
+    mock_response = MagicMock()
+    mock_response.text = '[{"i": 0, "summary": "Google batch summary."}]'
+    mock_response.prompt_feedback = None
+    mock_google_client_instance.models.generate_content.return_value = mock_response
+    mock_google_client_constructor.return_value = mock_google_client_instance
+
+    config = GoogleConfig(api_key="test_google_key", model="gemini-batch-test", temperature=0.2, max_output_tokens=50)
+    summarizer = Summarizer(repo=mock_repo, config=config)
+    summaries = summarizer.summarize_batch([("a.py", None)])
+
+    assert summaries == ["Google batch summary."]
+    generation_config = mock_google_client_instance.models.generate_content.call_args.kwargs["generation_config"]
+    assert generation_config == {
+        'temperature': 0.2,
+        'max_output_tokens': 50,
+        'response_mime_type': 'application/json',
+    }
+
+def test_summarize_batch_symbol_not_found(mock_repo):
+    """Test summarize_batch raises ValueError for an unknown symbol before calling the LLM."""
+    mock_repo.extract_symbols.return_value = []
+    summarizer = Summarizer(repo=mock_repo, config=OpenAIConfig(api_key="test_key"))
+    with pytest.raises(ValueError) as exc_info:
+        summarizer.summarize_batch([("file.py", "missing")])
+    assert str(exc_info.value) == "Could not find function or class 'missing' in 'file.py'."
+
+@patch.object(Summarizer, "_get_tokenizer", return_value=None)
+@patch('openai.OpenAI', create=True)
+def test_summarize_batch_sends_large_symbols_individually(mock_openai_constructor, mock_get_tokenizer, mock_repo):
+    """Test symbols over the batch per-item limit get their own request instead of a 'too large' result."""
+    large_code = "def big():\n" + "    x = 1\n" * 5000
+    mock_repo.extract_symbols.return_value = _symbol("big", "FUNCTION", large_code)
+    mock_openai_client = MagicMock()
+    single_response = MagicMock()
+    single_response.choices[0].message.content = "Big function summary."
+    mock_openai_client.chat.completions.create.return_value = single_response
+    mock_openai_constructor.return_value = mock_openai_client
+
+    summarizer = Summarizer(repo=mock_repo, config=OpenAIConfig(api_key="test_key"))
+    summaries = summarizer.summarize_batch([("file.py", "big")])
+
+    assert summaries == ["Big function summary."]
+    mock_openai_client.chat.completions.create.assert_called_once()
+    call_kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert "response_format" not in call_kwargs
+    assert large_code in call_kwargs["messages"][1]["content"]
+
+def test_summarize_batch_symbol_without_code(mock_repo):
+    """Test summarize_batch raises ValueError for a symbol with no code, like summarize_function does."""
+    mock_repo.extract_symbols.return_value = _symbol("empty", "FUNCTION", "")
+    summarizer = Summarizer(repo=mock_repo, config=OpenAIConfig(api_key="test_key"))
+    with pytest.raises(ValueError) as exc_info:
+        summarizer.summarize_batch([("file.py", "empty")])
+    assert str(exc_info.value) == "Could not find function 'empty' in 'file.py'."
+
+# --- Test async summarization ---
+
+@patch('openai.AsyncOpenAI', create=True)
+@patch('openai.OpenAI', create=True)
+def test_asummarize_function_openai(mock_openai_constructor, mock_async_openai_constructor, mock_repo):
+    """Test asummarize_function awaits the AsyncOpenAI client with the same request as the sync path."""
+    mock_func_code = "def my_func(a, b):\n    return a + b"
+    mock_repo.extract_symbols.return_value = _symbol("my_func", "FUNCTION", mock_func_code)
+
+    mock_async_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = "Async function summary."
+    mock_async_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    mock_async_openai_constructor.return_value = mock_async_client
+
+    config = OpenAIConfig(api_key="test_openai_key", model="gpt-async-test", temperature=0.4, max_tokens=90)
+    summarizer = Summarizer(repo=mock_repo, config=config)
+    summary = asyncio.run(summarizer.asummarize_function("src/module.py", "my_func"))
+
+    assert summary == "Async function summary."
+    mock_async_openai_constructor.assert_called_once_with(api_key="test_openai_key")
+    expected_user_prompt = f"Summarize the following function named 'my_func' from the file 'src/module.py'. Describe its purpose, parameters, and return value. The function definition is:\n\n```\n{mock_func_code}\n```"
+    mock_async_client.chat.completions.create.assert_awaited_once_with(
+        model="gpt-async-test",
+        messages=[
+            {"role": "system", "content": "You are an expert assistant skilled in creating concise code summaries for functions."},
+            {"role": "user", "content": expected_user_prompt}
+        ],
+        temperature=0.4,
+        max_tokens=90,
+    )
+
 # --- Test Helper for Mocking Summarizer --- 
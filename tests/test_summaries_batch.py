@@ -0,0 +1,171 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from codekite.summaries import AnthropicConfig, LLMError, OpenAIConfig, Summarizer
+from codekite.summaries_batch import AnthropicBatchStrategy, OpenAIBatchStrategy, get_batch_strategy
+
+
+class FakeRepo:
+    """Minimal fake Repository with in-memory file storage."""
+
+    def __init__(self, files, local_path_str: str = "."):
+        self._files = files
+        self.local_path = Path(local_path_str)
+
+    def get_file_content(self, path: str) -> str:
+        if path not in self._files:
+            raise FileNotFoundError(path)
+        return self._files[path]
+
+    def get_abs_path(self, path: str) -> str:
+        return path
+
+    def extract_symbols(self, path: str):
+        return [{"name": "Greeter", "type": "class", "code": "class Greeter:\n    pass"}]
+
+
+# --- Fake OpenAI batch client ----------------------------------------------
+
+
+class _FakeOpenAIFiles:
+    def __init__(self):
+        self.uploaded = None
+        self.output = ""
+
+    def create(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = file[1].getvalue().decode("utf-8")
+        return SimpleNamespace(id="file-in")
+
+    def content(self, file_id):
+        assert file_id == "file-out"
+        return SimpleNamespace(text=self.output)
+
+
+class _FakeOpenAIBatches:
+    def __init__(self):
+        self.status = "in_progress"
+
+    def create(self, input_file_id, endpoint, completion_window):
+        assert input_file_id == "file-in"
+        return SimpleNamespace(id="batch_123")
+
+    def retrieve(self, batch_id):
+        output_file_id = "file-out" if self.status == "completed" else None
+        return SimpleNamespace(id=batch_id, status=self.status, output_file_id=output_file_id)
+
+
+class FakeBatchOpenAI:
+    """Mimics the parts of openai.OpenAI used by OpenAIBatchStrategy."""
+
+    def __init__(self):
+        self.files = _FakeOpenAIFiles()
+        self.batches = _FakeOpenAIBatches()
+
+    def complete(self, replies):
+        """Marks the batch finished, echoing one reply per uploaded request."""
+        lines = []
+        for line in self.files.uploaded.splitlines():
+            custom_id = json.loads(line)["custom_id"]
+            body = {"choices": [{"message": {"content": f"  {replies[custom_id]}  "}}]}
+            lines.append(json.dumps({"custom_id": custom_id, "response": {"status_code": 200, "body": body}}))
+        self.files.output = "\n".join(lines)
+        self.batches.status = "completed"
+
+
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True)
+def _offline_token_counts(monkeypatch):
+    """Keeps token counting from downloading tiktoken encodings; counts fall back to len // 4."""
+    monkeypatch.setattr(Summarizer, "_get_tokenizer", lambda self, model_name: None)
+    monkeypatch.setattr(Summarizer, "_count_tokens", lambda self, text, model_name=None: len(text) // 4)
+
+
+def _openai_summarizer(files):
+    return Summarizer(FakeRepo(files), config=OpenAIConfig(api_key="test"), llm_client=FakeBatchOpenAI())
+
+
+def test_submit_and_fetch_openai_batch(tmp_path):
+    summarizer = _openai_summarizer({"a.py": "print('a')", "b.py": "class Greeter:\n    pass"})
+
+    batch_id = summarizer.submit_batch([("a.py", None), ("b.py", "Greeter")], batch_dir=str(tmp_path))
+
+    assert batch_id == "batch_123"
+    uploaded = [json.loads(line) for line in summarizer._llm_client.files.uploaded.splitlines()]
+    assert [r["custom_id"] for r in uploaded] == ["item-0", "item-1"]
+    assert all(r["url"] == "/v1/chat/completions" for r in uploaded)
+    assert "class Greeter" in uploaded[1]["body"]["messages"][1]["content"]
+    assert (tmp_path / "batch_123.json").exists()
+
+    assert summarizer.fetch_batch(batch_id, batch_dir=str(tmp_path)) is None
+
+    summarizer._llm_client.complete({"item-0": "File A.", "item-1": "Greeter class."})
+    assert summarizer.fetch_batch(batch_id, batch_dir=str(tmp_path)) == {
+        "a.py": "File A.",
+        "b.py::Greeter": "Greeter class.",
+    }
+
+
+def test_submit_batch_extracts_symbols_once_per_file(tmp_path):
+    summarizer = _openai_summarizer({"b.py": "class Greeter:\n    pass"})
+    extracted = []
+    extract_symbols = summarizer.repo.extract_symbols
+    summarizer.repo.extract_symbols = lambda path: extracted.append(path) or extract_symbols(path)
+
+    summarizer.submit_batch([("b.py", "Greeter")] * 3, batch_dir=str(tmp_path))
+
+    assert extracted == ["b.py"]
+    assert len(summarizer._llm_client.files.uploaded.splitlines()) == 3
+
+
+def test_fetch_batch_failed(tmp_path):
+    summarizer = _openai_summarizer({"a.py": "print('a')"})
+    batch_id = summarizer.submit_batch([("a.py", None)], batch_dir=str(tmp_path))
+    summarizer._llm_client.batches.status = "expired"
+
+    with pytest.raises(LLMError) as exc_info:
+        summarizer.fetch_batch(batch_id, batch_dir=str(tmp_path))
+    assert str(exc_info.value) == "openai batch batch_123 did not complete."
+
+
+def test_submit_batch_all_empty_raises(tmp_path):
+    summarizer = _openai_summarizer({"empty.py": "   "})
+
+    with pytest.raises(LLMError) as exc_info:
+        summarizer.submit_batch([("empty.py", None)], batch_dir=str(tmp_path))
+    assert str(exc_info.value).startswith("Nothing to submit")
+
+
+def test_submit_batch_missing_file(tmp_path):
+    summarizer = _openai_summarizer({})
+
+    with pytest.raises(FileNotFoundError):
+        summarizer.submit_batch([("missing.py", None)], batch_dir=str(tmp_path))
+
+
+def test_anthropic_batch_results():
+    succeeded = SimpleNamespace(
+        custom_id="item-0",
+        result=SimpleNamespace(type="succeeded", message=SimpleNamespace(content=[SimpleNamespace(text="Done.")])),
+    )
+    errored = SimpleNamespace(custom_id="item-1", result=SimpleNamespace(type="errored"))
+    batches = SimpleNamespace(
+        retrieve=lambda batch_id: SimpleNamespace(processing_status="ended"),
+        results=lambda batch_id: iter([succeeded, errored]),
+    )
+    strategy = AnthropicBatchStrategy(SimpleNamespace(messages=SimpleNamespace(batches=batches)))
+
+    assert strategy.status("msgbatch_1") == "completed"
+    assert strategy.results("msgbatch_1", ["item-0", "item-1"]) == {"item-0": "Done."}
+
+
+def test_get_batch_strategy():
+    assert isinstance(get_batch_strategy(OpenAIConfig(api_key="test"), object()), OpenAIBatchStrategy)
+    assert isinstance(get_batch_strategy(AnthropicConfig(api_key="test"), object()), AnthropicBatchStrategy)
+    with pytest.raises(LLMError):
+        get_batch_strategy(None, object())
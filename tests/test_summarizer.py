@@ -1,5 +1,8 @@
+import asyncio
 import pytest
-from codekite.summaries import Summarizer, LLMError
+from types import SimpleNamespace
+
+from codekite.summaries import Summarizer, LLMError, GoogleConfig, OpenAIConfig
 from pathlib import Path
 
 
@@ -32,8 +35,10 @@ class _FakeChatCompletions:
     def __init__(self, content: str, raise_exc: bool = False):
         self._content = content
         self._raise = raise_exc
+        self.create_call_count = 0
 
     def create(self, *args, **kwargs):  # noqa: D401
+        self.create_call_count += 1
         if self._raise:
             raise RuntimeError("API down")
         return _FakeCompletion(self._content)
@@ -46,6 +51,32 @@ class FakeOpenAI:
         self.chat = type("_Chat", (), {"completions": _FakeChatCompletions(summary, raise_exc)})()
 
 
+class _FakeAsyncChatCompletions:
+    def __init__(self, delay: float):
+        self._delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create(self, *args, **kwargs):  # noqa: D401
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay)
+        finally:
+            self.in_flight -= 1
+        # Echo the file name from the prompt so callers can check result ordering
+        prompt = kwargs["messages"][1]["content"]
+        return _FakeCompletion(prompt.split("'")[1])
+
+
+class FakeAsyncOpenAI:
+    """Mimics the parts of openai.AsyncOpenAI used by Summarizer."""
+
+    def __init__(self, delay: float = 0.05):
+        self.completions = _FakeAsyncChatCompletions(delay)
+        self.chat = type("_Chat", (), {"completions": self.completions})()
+
+
 # ---------------------------------------------------------------------------
 
 
@@ -70,3 +101,96 @@ def test_summarize_llm_error():
     summarizer = Summarizer(repo, llm_client=error_client)
     with pytest.raises(LLMError):
         summarizer.summarize_file("bar.py")
+
+
+def test_summarize_files_runs_concurrently():
+    paths = [f"f{i}.py" for i in range(10)]
+    repo = FakeRepo({p: f"x = {i}" for i, p in enumerate(paths)})
+    async_client = FakeAsyncOpenAI(delay=0.05)
+    summarizer = Summarizer(repo, llm_client=FakeOpenAI(), async_llm_client=async_client)
+
+    summaries = summarizer.summarize_files(paths, max_concurrency=4)
+
+    assert summaries == paths
+    assert async_client.completions.peak_in_flight == 4
+
+
+def test_asummarize_file_not_found():
+    repo = FakeRepo({})
+    summarizer = Summarizer(repo, llm_client=FakeOpenAI(), async_llm_client=FakeAsyncOpenAI())
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(summarizer.asummarize_file("missing.py"))
+
+
+def test_summarize_file_reuses_cached_summary():
+    repo = FakeRepo({"foo.py": "print('hello')"})
+    client = FakeOpenAI(summary="Cached summary")
+    summarizer = Summarizer(repo, llm_client=client, cache_enabled=True)
+
+    assert summarizer.summarize_file("foo.py") == "Cached summary"
+    assert summarizer.summarize_file("foo.py") == "Cached summary"
+    assert client.chat.completions.create_call_count == 1
+
+    repo._files["foo.py"] = "print('changed')"
+    summarizer.summarize_file("foo.py")
+    assert client.chat.completions.create_call_count == 2
+
+
+def test_summary_cache_persists_across_instances(tmp_path):
+    repo = FakeRepo({"foo.py": "print('hello')"})
+    Summarizer(repo, llm_client=FakeOpenAI(summary="On disk"), cache_dir=str(tmp_path)).summarize_file("foo.py")
+
+    client = FakeOpenAI(summary="Fresh")
+    summarizer = Summarizer(repo, llm_client=client, cache_dir=str(tmp_path))
+    assert summarizer.summarize_file("foo.py") == "On disk"
+    assert client.chat.completions.create_call_count == 0
+
+
+def test_summary_cache_disabled():
+    repo = FakeRepo({"foo.py": "print('hello')"})
+    client = FakeOpenAI()
+    summarizer = Summarizer(repo, llm_client=client, cache_enabled=False)
+    summarizer.summarize_file("foo.py")
+    summarizer.summarize_file("foo.py")
+    assert client.chat.completions.create_call_count == 2
+
+
+def test_summary_cache_off_by_default():
+    repo = FakeRepo({"foo.py": "print('hello')"})
+    client = FakeOpenAI()
+    summarizer = Summarizer(repo, llm_client=client)
+    summarizer.summarize_file("foo.py")
+    summarizer.summarize_file("foo.py")
+    assert client.chat.completions.create_call_count == 2
+
+
+def test_summary_cache_keyed_by_generation_params(tmp_path, monkeypatch):
+    monkeypatch.setattr(Summarizer, "_get_tokenizer", lambda self, model_name: None)
+    repo = FakeRepo({"foo.py": "print('hello')"})
+    config = OpenAIConfig(api_key="test", model="gpt-cache-test", temperature=0.2)
+    Summarizer(repo, config=config, llm_client=FakeOpenAI(summary="Cool"), cache_dir=str(tmp_path)).summarize_file(
+        "foo.py"
+    )
+
+    client = FakeOpenAI(summary="Warm")
+    warmer = OpenAIConfig(api_key="test", model="gpt-cache-test", temperature=0.9)
+    summarizer = Summarizer(repo, config=warmer, llm_client=client, cache_dir=str(tmp_path))
+    assert summarizer.summarize_file("foo.py") == "Warm"
+    assert client.chat.completions.create_call_count == 1
+
+
+def test_summary_cache_keyed_by_model_kwargs(tmp_path):
+    repo = FakeRepo({"foo.py": "print('hello')"})
+    calls = []
+
+    def generate_content(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(text=f"Reply {len(calls)}", prompt_feedback=None)
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+    for top_p in (0.5, 0.5, 0.9):
+        config = GoogleConfig(api_key="test", model="gemini-cache-test", model_kwargs={"top_p": top_p})
+        Summarizer(repo, config=config, llm_client=client, cache_dir=str(tmp_path)).summarize_file("foo.py")
+
+    # The repeated settings hit the cache; only the changed top_p reaches the provider again
+    assert [c["generation_config"]["top_p"] for c in calls] == [0.5, 0.9]
@@ -1,10 +1,13 @@
 import tempfile
+import threading
 from pathlib import Path
 
 import pytest
 
 from codekite.tree_sitter_symbol_extractor import TreeSitterSymbolExtractor
 
+pytestmark = pytest.mark.usefixtures("_warm_parsers")
+
 SAMPLES = {
     ".py": "def foo():\n    pass\n\nclass Bar:\n    pass\n",
     ".js": "function foo() {}\nclass Bar {}\n",
@@ -27,3 +30,36 @@ def test_symbol_extraction(ext: str, code: str):
     # Simple sanity: expect 'foo' OR 'Bar' present
     names = {s.get("name") for s in symbols}
     assert any(name in names for name in {"foo", "Bar", "main"}), f"Expected symbols missing for {ext}: {names}"
+
+
+def test_parsers_and_queries_are_shared_per_language():
+    TreeSitterSymbolExtractor.preload([".ts", ".tsx", ".py"])
+
+    assert TreeSitterSymbolExtractor.get_parser(".ts") is TreeSitterSymbolExtractor.get_parser(".tsx")
+    assert TreeSitterSymbolExtractor.get_query(".ts") is TreeSitterSymbolExtractor.get_query(".tsx")
+    assert TreeSitterSymbolExtractor.get_query(".py") is TreeSitterSymbolExtractor.get_query(".py")
+    assert {"typescript", "python"} <= set(TreeSitterSymbolExtractor._queries)
+
+
+def test_extract_symbols_accepts_bytes():
+    code = SAMPLES[".py"]
+    assert TreeSitterSymbolExtractor.extract_symbols(".py", code.encode("utf-8")) == (
+        TreeSitterSymbolExtractor.extract_symbols(".py", code)
+    )
+
+
+def test_each_thread_gets_its_own_parser():
+    parsers = []
+    worker = threading.Thread(target=lambda: parsers.append(TreeSitterSymbolExtractor.get_parser(".py")))
+    worker.start()
+    worker.join()
+
+    assert TreeSitterSymbolExtractor.get_parser(".py") is TreeSitterSymbolExtractor.get_parser(".py")
+    assert parsers[0] is not TreeSitterSymbolExtractor.get_parser(".py")
+
+
+def test_symbol_text_uses_byte_offsets_for_non_ascii_source():
+    code = 'GREETING = "héllo"\n\ndef ünicode():\n    return "é"\n'
+    symbols = TreeSitterSymbolExtractor.extract_symbols(".py", code.encode("utf-8"))
+    func = next(s for s in symbols if s["name"] == "ünicode")
+    assert func["code"] == 'def ünicode():\n    return "é"'
@@ -1,23 +1,35 @@
 import tempfile
 import os
+import numpy as np
 import pytest
 from codekite import Repository
-from codekite.vector_searcher import VectorSearcher, ChromaDBBackend
+from codekite.vector_searcher import FINGERPRINT_PROBE, VectorSearcher, ChromaDBBackend, NumpyBackend
 from pathlib import Path
 import chromadb.api.shared_system_client as _ssc
 
-# Auto-reset Chroma global System registry between tests to avoid
-# "An instance of Chroma already exists for ephemeral with different settings" errors.
-@pytest.fixture(autouse=True)
-def _reset_chroma_system():
+# Each test gets its own Chroma directory. Chroma keeps one System per directory,
+# so tests are isolated without tearing the System registry down after every test.
+@pytest.fixture
+def chroma_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("chroma"))
+
+@pytest.fixture(scope="session", autouse=True)
+def _clear_chroma_systems():
     yield
     _ssc.SharedSystemClient._identifier_to_system.clear()
 
+# One file with 130 one-line functions, written once and shared by the tests in this module
+@pytest.fixture(scope="module")
+def many_defs_repo(tmp_path_factory):
+    repo_dir = tmp_path_factory.mktemp("many_defs")
+    (repo_dir / "e.py").write_text("\n".join(f"def f{i}(): pass" for i in range(130)))
+    return Repository(str(repo_dir))
+
 def dummy_embed(text):
     # Simple deterministic embedding for testing (sum of char codes)
     return [sum(ord(c) for c in text) % 1000]
 
-def test_vector_searcher_build_and_query():
+def test_vector_searcher_build_and_query(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         # Create a simple file
         fpath = os.path.join(tmpdir, "a.py")
@@ -27,7 +39,7 @@ def foo(): pass
 class Bar: pass
 """)
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = repository.get_vector_searcher(embed_fn=dummy_embed, persist_dir=chroma_dir)
         vs.build_index(chunk_by="symbols")
         results = vs.search("foo", top_k=2)
         assert isinstance(results, list)
@@ -36,7 +48,7 @@ class Bar: pass
         results2 = repository.search_semantic("Bar", embed_fn=dummy_embed)
         assert any("Bar" in (r.get("name") or "") for r in results2)
 
-def test_vector_searcher_multiple_files():
+def test_vector_searcher_multiple_files(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         files = [
             ("a.py", "def foo(): pass\nclass Bar: pass\n"),
@@ -48,7 +60,7 @@ def test_vector_searcher_multiple_files():
             with open(os.path.join(tmpdir, fname), "w", encoding="utf-8") as f:
                 f.write(content)
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = VectorSearcher(repository, embed_fn=dummy_embed, persist_dir=chroma_dir)
         vs.build_index(chunk_by="symbols")
         # Should find foo, Bar, baz, ünicode
         results = vs.search("foo", top_k=10)
@@ -60,63 +72,59 @@ def test_vector_searcher_multiple_files():
         results = vs.search("ünicode", top_k=10)
         assert any("ünicode" in (r.get("name") or "") for r in results)
 
-def test_vector_searcher_empty_and_comment_files():
+def test_vector_searcher_empty_and_comment_files(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         with open(os.path.join(tmpdir, "c.py"), "w") as f:
             f.write("# just a comment\n\n")
         with open(os.path.join(tmpdir, "d.py"), "w") as f:
             f.write("")
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = VectorSearcher(repository, embed_fn=dummy_embed, persist_dir=chroma_dir)
         vs.build_index(chunk_by="symbols")
         # Should not crash or index anything meaningful
         results = vs.search("anything", top_k=5)
         assert isinstance(results, list)
 
-def test_vector_searcher_chunk_by_lines():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        with open(os.path.join(tmpdir, "e.py"), "w") as f:
-            f.write("\n".join([f"def f{i}(): pass" for i in range(100)]))
-        repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
-        vs.build_index(chunk_by="lines")
-        results = vs.search("f42", top_k=10)
-        assert isinstance(results, list)
+def test_vector_searcher_chunk_by_lines(many_defs_repo, chroma_dir):
+    vs = VectorSearcher(many_defs_repo, embed_fn=dummy_embed, persist_dir=chroma_dir)
+    vs.build_index(chunk_by="lines")
+    results = vs.search("f42", top_k=10)
+    assert isinstance(results, list)
 
-def test_vector_searcher_search_nonexistent():
+def test_vector_searcher_search_nonexistent(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         with open(os.path.join(tmpdir, "f.py"), "w") as f:
             f.write("def hello(): pass\n")
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = VectorSearcher(repository, embed_fn=dummy_embed, persist_dir=chroma_dir)
         vs.build_index()
         results = vs.search("nonexistent", top_k=5)
         assert isinstance(results, list)
         assert all("nonexistent" not in (r.get("name") or "") for r in results)
 
-def test_vector_searcher_top_k_bounds():
+def test_vector_searcher_top_k_bounds(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         with open(os.path.join(tmpdir, "g.py"), "w") as f:
             f.write("def a(): pass\ndef b(): pass\n")
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = VectorSearcher(repository, embed_fn=dummy_embed, persist_dir=chroma_dir)
         vs.build_index()
         results = vs.search("a", top_k=10)
         assert len(results) <= 10
         results_zero = vs.search("a", top_k=0)
         assert results_zero == [] or len(results_zero) == 0
 
-def test_vector_searcher_edge_case_queries():
+def test_vector_searcher_edge_case_queries(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         with open(os.path.join(tmpdir, "h.py"), "w") as f:
             f.write("def edgecase(): pass\n")
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = VectorSearcher(repository, embed_fn=dummy_embed, persist_dir=chroma_dir)
         vs.build_index()
         assert vs.search("", top_k=5) == [] or isinstance(vs.search("", top_k=5), list)
         assert isinstance(vs.search("$%^&*", top_k=5), list)
 
-def test_vector_searcher_identical_embeddings():
+def test_vector_searcher_identical_embeddings(chroma_dir):
     def constant_embed(text):
         return [42]
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -124,7 +132,7 @@ def test_vector_searcher_identical_embeddings():
             with open(os.path.join(tmpdir, f"i{i}.py"), "w") as f:
                 f.write(f"def func{i}(): pass\n")
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=constant_embed)
+        vs = VectorSearcher(repository, embed_fn=constant_embed, persist_dir=chroma_dir)
         vs.build_index()
         results = vs.search("anything", top_k=5)
         assert len(results) == 3
@@ -137,44 +145,240 @@ def test_vector_searcher_missing_embed_fn():
         with pytest.raises(ValueError):
             repository.get_vector_searcher()
 
-def test_vector_searcher_persistency():
+def test_vector_searcher_persistency(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         fpath = os.path.join(tmpdir, "k.py")
         with open(fpath, "w") as f:
             f.write("def persist(): pass\n")
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = VectorSearcher(repository, embed_fn=dummy_embed, persist_dir=chroma_dir)
         vs.build_index()
         # Simulate restart by creating new VectorSearcher with same persist_dir and backend
         new_vs = VectorSearcher(repository, embed_fn=dummy_embed, persist_dir=vs.persist_dir, backend=vs.backend)
         results = new_vs.search("persist", top_k=2)
         assert any("persist" in (r.get("name") or "") for r in results)
 
-def test_vector_searcher_overwrite_index():
+def test_vector_searcher_overwrite_index(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         fpath = os.path.join(tmpdir, "l.py")
         with open(fpath, "w") as f:
             f.write("def first(): pass\n")
+        embedded = []
+
+        def counting_embed(text):
+            if isinstance(text, str) and text != FINGERPRINT_PROBE:
+                embedded.append(text)
+            return dummy_embed(text)
+
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = VectorSearcher(repository, embed_fn=counting_embed, persist_dir=chroma_dir)
         vs.build_index()
         with open(fpath, "a") as f:
             f.write("def second(): pass\n")
+        embedded.clear()
         vs.build_index()
+        # Only the new chunk is embedded on rebuild
+        assert embedded == ["def second(): pass"]
+        assert vs.chunk_embeddings.shape == (1, 1)
+        assert len(vs.chunk_embedding_ids) == 1 and vs.chunk_embedding_ids[0] in vs.backend.get_ids()
+        assert vs.backend.count() == 2
         results = vs.search("second", top_k=2)
         assert any("second" in (r.get("name") or "") for r in results)
 
-def test_vector_searcher_similar_queries():
+        with open(fpath, "w") as f:
+            f.write("\n\ndef second(): pass\n")
+        embedded.clear()
+        vs.build_index()
+        # Removed chunks are deleted; moved chunks keep their embedding but get fresh line numbers
+        assert embedded == []
+        assert vs.backend.count() == 1
+        assert vs.search("second", top_k=1)[0]["start_line"] == 2
+
+@pytest.mark.parametrize("make_backend", [ChromaDBBackend, NumpyBackend])
+def test_vector_searcher_rebuilds_when_embed_fn_changes(chroma_dir, make_backend):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "n.py"), "w") as f:
+            f.write("def small(): pass\ndef large(): pass\n")
+        repository = Repository(tmpdir)
+
+        def embed_2d(text):
+            return [len(text), sum(ord(c) for c in text) % 1000]
+
+        def embed_5d(text):
+            return [float(len(text))] * 4 + [sum(ord(c) for c in text) % 1000]
+
+        vs = VectorSearcher(repository, embed_fn=embed_2d, backend=make_backend(chroma_dir))
+        vs.build_index()
+        vs.backend.persist()
+
+        # Same persist_dir, unchanged code, a different embedding function
+        new_vs = VectorSearcher(repository, embed_fn=embed_5d, backend=make_backend(chroma_dir))
+        new_vs.build_index()
+        assert new_vs.chunk_embeddings.shape == (2, 5)
+        assert new_vs.backend.count() == 2
+        assert new_vs.backend.get_fingerprint()["dim"] == 5
+        assert new_vs.search("def large(): pass", top_k=1)[0]["name"] == "large"
+
+def _scaled_embed(factor):
+    # Closures from one factory share a qualname and a dimension but produce different vectors
+    return lambda text: [factor * len(text), factor * (sum(ord(c) for c in text) % 1000)]
+
+@pytest.mark.parametrize("persisted", [True, False])
+def test_vector_searcher_rebuilds_for_same_named_embed_fn(chroma_dir, persisted):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "o.py"), "w") as f:
+            f.write("def small(): pass\ndef large(): pass\n")
+        repository = Repository(tmpdir)
+        persist_dir = chroma_dir if persisted else None
+        VectorSearcher(repository, embed_fn=_scaled_embed(1.0), persist_dir=persist_dir).build_index()
+
+        calls = []
+        scaled = _scaled_embed(-3.0)
+
+        def embed(text):
+            calls.append(text)
+            return scaled(text)
+
+        new_vs = VectorSearcher(repository, embed_fn=embed, persist_dir=persist_dir)
+        new_vs.build_index()
+        # Every chunk is embedded with the new function, and scores come from its vectors only
+        assert new_vs.chunk_embeddings.shape == (2, 2)
+        assert sorted(text for text in calls if isinstance(text, str) and text != FINGERPRINT_PROBE) == [
+            "def large(): pass",
+            "def small(): pass",
+        ]
+        assert new_vs.backend.count() == 2
+        assert new_vs.search("def large(): pass", top_k=1)[0]["score"] == pytest.approx(0.0, abs=1e-3)
+
+def test_vector_searcher_in_memory_by_default(tmp_path, monkeypatch):
+    work_dir = tmp_path / "cwd"
+    work_dir.mkdir()
+    monkeypatch.chdir(work_dir)
+    searchers = []
+    for name in ("alpha", "beta"):
+        repo_dir = tmp_path / name
+        repo_dir.mkdir()
+        (repo_dir / f"{name}.py").write_text(f"def {name}(): pass\n")
+        vs = VectorSearcher(Repository(str(repo_dir)), embed_fn=dummy_embed)
+        vs.build_index()
+        searchers.append(vs)
+
+    # Nothing is written to disk, and each repository gets its own collection
+    assert list(work_dir.iterdir()) == []
+    assert [r["name"] for r in searchers[0].search("alpha", top_k=5)] == ["alpha"]
+    assert [r["name"] for r in searchers[1].search("beta", top_k=5)] == ["beta"]
+
+def test_vector_searcher_similar_queries(chroma_dir):
     with tempfile.TemporaryDirectory() as tmpdir:
         with open(os.path.join(tmpdir, "m.py"), "w") as f:
             f.write("def hello(): pass\ndef hell(): pass\n")
         repository = Repository(tmpdir)
-        vs = VectorSearcher(repository, embed_fn=dummy_embed)
+        vs = VectorSearcher(repository, embed_fn=dummy_embed, persist_dir=chroma_dir)
         vs.build_index()
         results = vs.search("hell", top_k=2)
         assert any("hell" in (r.get("name") or "") for r in results)
         assert any("hello" in (r.get("name") or "") for r in results)
 
+def test_vector_searcher_embeds_in_sub_batches(many_defs_repo, chroma_dir):
+    batch_sizes = []
+
+    def batch_embed(texts):
+        if isinstance(texts, str):
+            return dummy_embed(texts)
+        batch_sizes.append(len(texts))
+        return [dummy_embed(t) for t in texts]
+
+    vs = VectorSearcher(many_defs_repo, embed_fn=batch_embed, persist_dir=chroma_dir)
+    vs.build_index()
+    assert batch_sizes == [64, 64, 2]
+    assert vs.chunk_embeddings.dtype == np.float32
+    assert vs.chunk_embeddings.shape == (130, 1)
+    assert any("f42" == r.get("name") for r in vs.search("f42", top_k=130))
+
+def test_vector_searcher_passes_lists_to_backend():
+    received = []
+
+    class ListOnlyBackend(NumpyBackend):
+        def add(self, embeddings, metadatas, ids=None, overwrite=True):
+            if not embeddings:  # third-party backends may test truthiness, which ndarrays reject
+                return
+            received.append(embeddings)
+            super().add(embeddings, metadatas, ids=ids, overwrite=overwrite)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "q.py"), "w") as f:
+            f.write("def listed(): pass\n")
+        vs = VectorSearcher(Repository(tmpdir), embed_fn=dummy_embed, backend=ListOnlyBackend())
+        vs.build_index()
+    assert len(received) == 1 and isinstance(received[0], list)
+    assert vs.search("def listed(): pass", top_k=1)[0]["name"] == "listed"
+
+def test_numpy_backend_matches_chroma_top_k():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((2000, 16)).astype(np.float32)
+    metadatas = [{"i": i} for i in range(len(vectors))]
+    ids = [str(i) for i in range(len(vectors))]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        chroma = ChromaDBBackend(tmpdir)
+        chroma.add(vectors, metadatas, ids=ids)
+        numpy_backend = NumpyBackend()
+        numpy_backend.add(vectors, metadatas, ids=ids)
+        for query in rng.standard_normal((5, 16)).astype(np.float32):
+            expected = [hit["i"] for hit in chroma.query(query.tolist(), 10)]
+            hits = numpy_backend.query(query, 10)
+            assert [hit["i"] for hit in hits] == expected
+            assert [hit["score"] for hit in hits] == sorted(hit["score"] for hit in hits)
+
+def test_vector_searcher_numpy_backend_persistence():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "p.py"), "w") as f:
+            f.write("def persist(): pass\ndef other(): pass\n")
+        repository = Repository(tmpdir)
+        persist_dir = os.path.join(tmpdir, ".np_index")
+        vs = VectorSearcher(repository, embed_fn=dummy_embed, backend=NumpyBackend(persist_dir))
+        vs.build_index()
+        assert vs.backend.count() == 2
+
+        reloaded = NumpyBackend(persist_dir)
+        assert sorted(reloaded.get_ids()) == sorted(vs.backend.get_ids())
+        new_vs = VectorSearcher(repository, embed_fn=dummy_embed, backend=reloaded)
+        assert new_vs.search("def persist(): pass", top_k=1)[0]["name"] == "persist"
+
+@pytest.mark.parametrize("quantization,max_size_ratio", [("float16", 0.5), ("int8", 0.25)])
+def test_numpy_backend_quantization(quantization, max_size_ratio):
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((1000, 384)).astype(np.float32)
+    metadatas = [{"i": i} for i in range(len(vectors))]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        exact = NumpyBackend(os.path.join(tmpdir, "fp32"))
+        quantized = NumpyBackend(os.path.join(tmpdir, quantization), quantization=quantization)
+        for backend in (exact, quantized):
+            backend.add(vectors, metadatas)
+            backend.persist()
+
+        exact_size = os.path.getsize(os.path.join(tmpdir, "fp32", "vectors.npy"))
+        quantized_size = os.path.getsize(os.path.join(tmpdir, quantization, "vectors.npy"))
+        assert quantized_size <= exact_size * max_size_ratio + 128  # allow for the .npy header
+
+        for query in rng.standard_normal((5, 384)).astype(np.float32):
+            expected = {hit["i"] for hit in exact.query(query, 10)}
+            found = {hit["i"] for hit in quantized.query(query, 10)}
+            assert len(expected & found) >= 9
+
+        reloaded = NumpyBackend(os.path.join(tmpdir, quantization))
+        assert reloaded.query(vectors[3], 1)[0]["i"] == 3
+
+def test_numpy_backend_rejects_unknown_quantization():
+    with pytest.raises(ValueError):
+        NumpyBackend(quantization="int4")
+
+def test_import_does_not_load_chromadb():
+    import subprocess
+    import sys
+    code = "import sys, codekite; assert 'chromadb' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
 # --- New test using actual sentence-transformers ---
 
 MODEL_NAME = "all-MiniLM-L6-v2"
@@ -204,8 +408,11 @@ def test_vector_searcher_with_sentence_transformer():
 
     model = SentenceTransformer(MODEL_NAME)
 
-    def st_embed_fn(text: str) -> list[float]:
-        return model.encode([text])[0].tolist()
+    def st_embed_fn(texts):
+        # build_index passes lists of up to 64 texts; search passes a single query string
+        if isinstance(texts, str):
+            return model.encode([texts])[0].tolist()
+        return model.encode(texts, batch_size=64, convert_to_numpy=True)
 
     with tempfile.TemporaryDirectory() as tmpdir_st:
         repo_path = Path(tmpdir_st)